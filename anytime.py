@@ -0,0 +1,150 @@
+"""
+Anytime solving under a time budget.
+
+The stages run in order and every stage starts from the best plan found so far:
+
+1. "nw": North-West corner, O(m + n), always returned even with no time left;
+2. the initial methods (Vogel's, Russell's, ... in the given order), each kept if it is cheaper;
+3. "modi": MODI pivots from the best plan, yielding every plan they make cheaper;
+4. "optimal": MODI found no entering cell.
+
+Every stage checks the deadline between allocations, cost index lines, the line scans
+of the engines' setup and updates, the rows of the MODI basis construction and pricing,
+and pivots, so the solve stops within one such step of the deadline. A cost index cut
+short by the deadline stays on the solver (see `build_cost_index`): nothing large is
+freed when the solve returns, and the next solve resumes the sort.
+"""
+import gc
+import time
+
+from combined_version import indexed_least_cost, indexed_russell, indexed_vogel
+from modi import SpanningTreeBasis
+from report import SolveResult
+
+# Incremental engines of the initial methods the anytime solve can run
+ENGINES = {"vogel": indexed_vogel, "russell": indexed_russell, "least_cost": indexed_least_cost}
+
+
+class AnytimeResult(SolveResult):
+    """
+    Best plan of an anytime solve; `solution` holds `(row, col, quantity)` cells and
+    `method` names the stage that produced it.
+
+    - `stage` Last stage completed: "nw", a method name, "modi" (at least one pivot) or "optimal".
+    - `pivots` MODI pivots performed.
+    - `timed_out` The deadline stopped the solve before the plan was proven optimal.
+    """
+    def __init__(self, method, solution, costs, elapsed, dummy_flow, total_cost, stage, pivots, timed_out=False):
+        super().__init__(method, solution, costs, elapsed, dummy_flow, total_cost)
+        self.stage = stage
+        self.pivots = pivots
+        self.timed_out = timed_out
+
+
+def _plan_cost(costs, cells):
+    return sum(costs[i][j] * quantity for i, j, quantity in cells if quantity)
+
+
+def _collector_paused(stages):
+    # The cyclic collector only runs while the caller has control: this process-wide
+    # switch is opt-in (`pause_gc`), for callers that can afford it
+    enabled = gc.isenabled()
+    try:
+        while True:
+            gc.disable()
+            try:
+                result = next(stages, None)
+            finally:
+                if enabled:
+                    gc.enable()
+            if result is None:
+                return
+            yield result
+    finally:
+        stages.close()
+
+
+def iter_anytime(solver, budget: float = 0.2, methods=("vogel", "russell"), pause_gc: bool = False):
+    """
+    Yields an `AnytimeResult` every time the best plan of `solver` improves or a stage is
+    completed, until the plan is optimal or `budget` seconds have passed.
+
+    - `methods` Initial methods tried after North-West, in order (keys of `ENGINES`).
+    - `pause_gc` Disable the cyclic garbage collector (for the whole process) while the
+      stages run, so a full collection over a large cost index cannot overshoot the budget.
+
+    The last result yielded is the final one; its `timed_out` is set if the deadline
+    stopped the solve.
+    """
+    for method in methods:
+        if method not in ENGINES:
+            raise ValueError(f"Unknown method {method!r}, expected some of {', '.join(ENGINES)}")
+    stages = _stages(solver, budget, methods)
+    return _collector_paused(stages) if pause_gc else stages
+
+
+def _stages(solver, budget, methods):
+    start = time.perf_counter()
+    deadline = start + budget
+    costs = solver.costs
+
+    def snapshot(method, cells, total_cost, stage, pivots, timed_out=False):
+        return AnytimeResult(method, cells, costs, time.perf_counter() - start, solver.dummy_flow(cells),
+                             total_cost, stage, pivots, timed_out)
+
+    cells = solver.nw_method(compact=True)
+    best = snapshot("nw", cells, _plan_cost(costs, cells), "nw", 0)
+    yield best
+    stage, pivots = "nw", 0
+
+    try:
+        for method in methods:
+            index = solver.build_cost_index(deadline)
+            cells = []
+            for cell in ENGINES[method](solver.supply, solver.demand, *index, deadline=deadline):
+                if time.perf_counter() > deadline:
+                    raise TimeoutError()
+                cells.append(cell)
+            total_cost = _plan_cost(costs, cells)
+            stage = method
+            if total_cost < best.total_cost:
+                best = snapshot(method, cells, total_cost, stage, 0)
+            else:
+                best = snapshot(best.method, best.solution, best.total_cost, stage, 0)
+            yield best
+
+        basis = SpanningTreeBasis(costs, best.solution, deadline)
+        while True:
+            cell = basis.entering_cell(deadline)
+            if cell is None:
+                yield snapshot(best.method, best.solution, best.total_cost, "optimal", pivots)
+                return
+            if time.perf_counter() > deadline:
+                raise TimeoutError()
+            basis.pivot(*cell)
+            pivots += 1
+            stage = "modi"
+            cells = sorted((i, j, quantity) for (i, j), quantity in basis.flow.items())
+            total_cost = _plan_cost(costs, cells)
+            # Degenerate pivots change the basis but not the plan's cost
+            if total_cost < best.total_cost:
+                best = snapshot("modi", cells, total_cost, stage, pivots)
+                yield best
+    except TimeoutError:
+        yield snapshot(best.method, best.solution, best.total_cost, stage, pivots, timed_out=True)
+
+
+def anytime_solve(solver, budget: float = 0.2, methods=("vogel", "russell"), callback=None,
+                  pause_gc: bool = False) -> AnytimeResult:
+    """
+    Runs `iter_anytime` to the end and returns its final `AnytimeResult`.
+
+    - `callback` Called with every intermediate `AnytimeResult`, e.g. to publish the
+      current best plan while the solve goes on.
+    - `pause_gc` See `iter_anytime`.
+    """
+    result = None
+    for result in iter_anytime(solver, budget, methods, pause_gc):
+        if callback is not None:
+            callback(result)
+    return result
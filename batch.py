@@ -0,0 +1,77 @@
+import time
+from multiprocessing import Pool
+
+from combined_version import METHODS, BalancedProlemSolver, solution_cost
+from validation import TransportationProblemError
+
+
+class BatchResult:
+    """
+    Result of one method on one instance of a batch.
+
+    - `index` Position of the instance in the input iterable.
+    - `method` Method name (key of `METHODS`).
+    - `solution` Allocation matrix, or `(row, col, quantity)` cells from `shared.solve_scenarios`
+      (None if the instance failed).
+    - `total_cost` Cost of `solution`.
+    - `elapsed` Seconds spent by the method.
+    - `error` Message if the instance could not be solved.
+    """
+    def __init__(self, index, method, solution=None, total_cost=None, elapsed=0.0, error=None):
+        self.index = index
+        self.method = method
+        self.solution = solution
+        self.total_cost = total_cost
+        self.elapsed = elapsed
+        self.error = error
+
+
+def solve_instance(index, instance, methods):
+    """Runs every method in `methods` on one `(supply, demand, costs)` instance."""
+    supply, demand, costs = instance
+    try:
+        solver = BalancedProlemSolver(list(supply), list(demand), costs)
+    except TransportationProblemError as error:
+        return [BatchResult(index, method, error=str(error)) for method in methods]
+
+    results = []
+    for method in methods:
+        try:
+            start = time.perf_counter()
+            solution = METHODS[method](solver)
+            elapsed = time.perf_counter() - start
+        except TransportationProblemError as error:
+            results.append(BatchResult(index, method, error=str(error)))
+            continue
+        results.append(BatchResult(index, method, solution, solution_cost(costs, solution), elapsed))
+    return results
+
+
+def _solve_task(args):
+    index, instance, methods = args
+    return solve_instance(index, instance, methods)
+
+
+def solve_batch(instances, methods=("nw", "vogel", "russell"), processes=None, chunksize: int = 8):
+    """
+    Solves many `(supply, demand, costs)` instances on a process pool.
+
+    - `instances` Iterable of instances; it is consumed lazily.
+    - `methods` Names from `METHODS` to run on every instance.
+    - `processes` Pool size (`None` = number of CPUs, `0` = solve in this process).
+    - `chunksize` Instances sent to a worker at once.
+
+    Yields a list of `BatchResult` (one per method) for every instance, in completion order.
+    """
+    for method in methods:
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}, expected one of {', '.join(METHODS)}")
+
+    tasks = ((index, instance, tuple(methods)) for index, instance in enumerate(instances))
+    if processes == 0:
+        for task in tasks:
+            yield _solve_task(task)
+        return
+
+    with Pool(processes) as pool:
+        yield from pool.imap_unordered(_solve_task, tasks, chunksize)
@@ -0,0 +1,801 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+from anytime import ENGINES, anytime_solve
+from batch import solve_batch
+from cache import ResultCache, fingerprint
+from combined_version import (
+    METHODS, BalancedProlemSolver, CostIndex, indexed_russell, indexed_vogel, north_west_corner, solution_cost,
+)
+from dtypes import compact_costs
+from instrumentation import Sink
+from modi import modi_method
+from outofcore import solve_out_of_core
+from portfolio import run_portfolio
+from problem_io import BINARY_EXTENSION, convert_to_binary, load_problem, open_binary, write_binary, write_problem
+from service import SolveService, load_test
+from session import SolverSession
+from shared import SharedCostMatrix
+from sweep import Sweep
+
+
+DISTRIBUTIONS = ("uniform", "clustered", "sparse")
+
+
+# Function to generate a random balanced problem
+def random_problem(m: int, n: int, seed: int = 0, max_cost: int = 100, distribution: str = "uniform"):
+    """
+    Seeded random balanced problem.
+
+    - `distribution` "uniform": costs uniform in [1, max_cost];
+      "clustered": sources and destinations are points around a few cluster centres and
+      the cost is their distance, so whole blocks of lanes are cheap or expensive;
+      "sparse": ~5% cheap lanes, every other lane costs 10 * max_cost.
+    - `max_cost` None returns only the quantities (costs are None).
+    """
+    rng = random.Random(seed)
+    supply = [rng.randint(1, 100) for _ in range(m)]
+    demand = [rng.randint(1, 100) for _ in range(n)]
+    difference = sum(supply) - sum(demand)
+    if difference > 0:
+        demand[-1] += difference
+    else:
+        supply[-1] -= difference
+    if max_cost is None:
+        return supply, demand, None  # quantities only
+
+    if distribution == "uniform":
+        costs = [[rng.randint(1, max_cost) for _ in range(n)] for _ in range(m)]
+    elif distribution == "clustered":
+        centres = [(rng.uniform(0, max_cost), rng.uniform(0, max_cost)) for _ in range(5)]
+
+        def point():
+            x, y = rng.choice(centres)
+            return x + rng.gauss(0, max_cost / 20), y + rng.gauss(0, max_cost / 20)
+
+        sources = [point() for _ in range(m)]
+        destinations = [point() for _ in range(n)]
+        costs = [[1 + int(((sx - dx) ** 2 + (sy - dy) ** 2) ** 0.5) for dx, dy in destinations]
+                 for sx, sy in sources]
+    elif distribution == "sparse":
+        expensive = 10 * max_cost
+        costs = [[rng.randint(1, max_cost) if rng.random() < 0.05 else expensive for _ in range(n)]
+                 for _ in range(m)]
+    else:
+        raise ValueError(f"Unknown distribution {distribution!r}")
+    return supply, demand, costs
+
+
+def bench_modi(args):
+    """MODI warm-started from every initial method: iterations and time per pivot."""
+    starts = {"NW": METHODS["nw"], "Vogel": METHODS["vogel"], "Russell": METHODS["russell"],
+              "LeastCost": METHODS["least_cost"]}
+    print(f"{'size':>10} | {'start':<9} | {'initial':>10} | {'optimal':>10} | {'pivots':>6} | "
+          f"{'start s':>8} | {'MODI s':>8} | {'ms/pivot':>8}")
+    for size in args.sizes:
+        supply, demand, costs = random_problem(size, size, args.seed)
+        solver = BalancedProlemSolver(supply, demand, costs)
+        for name, start in starts.items():
+            begin = time.perf_counter()
+            initial = start(solver)
+            start_time = time.perf_counter() - begin
+            initial_cost = solution_cost(costs, initial)
+
+            result = modi_method(costs, initial)
+            per_pivot = 1000 * result.elapsed / result.iterations if result.iterations else 0.0
+            print(f"{f'{size}x{size}':>10} | {name:<9} | {initial_cost:>10} | {result.total_cost:>10} | "
+                  f"{result.iterations:>6} | {start_time:>8.3f} | {result.elapsed:>8.3f} | {per_pivot:>8.3f}")
+
+
+def bench_batch(args):
+    """Throughput of `solve_batch` for growing pool sizes."""
+    instances = [random_problem(args.size, args.size, args.seed + k) for k in range(args.instances)]
+    print(f"{'processes':>9} | {'seconds':>8} | {'inst/s':>8} | {'speedup':>7}")
+    baseline = None
+    for processes in args.processes:
+        start = time.perf_counter()
+        for _ in solve_batch(instances, processes=processes, chunksize=args.chunksize):
+            pass
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{processes:>9} | {elapsed:>8.3f} | {len(instances) / elapsed:>8.1f} | {baseline / elapsed:>7.2f}")
+
+
+def bench_parse(args):
+    """Bulk parsing of a generated size x size problem file."""
+    supply, demand, _ = random_problem(args.size, args.size, args.seed, max_cost=None)
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"problem.{args.format}")
+        separator = ',' if args.format == "csv" else ' '
+        with open(path, 'w') as stream:
+            # Rows are written one by one so the generator never holds the whole matrix
+            row = [0] * args.size
+            write_problem(stream, supply, demand, [], args.format)
+            for _ in range(args.size):
+                for j in range(args.size):
+                    row[j] = rng.randint(1, 1000)
+                stream.write(separator.join(map(str, row)) + '\n')
+        size_mb = os.path.getsize(path) / 2 ** 20
+
+        start = time.perf_counter()
+        _, _, costs = load_problem(path)
+        elapsed = time.perf_counter() - start
+
+    cells = args.size * args.size
+    print(f"{args.size}x{args.size} ({cells:,} cells, {size_mb:.1f} MiB {args.format}): "
+          f"parsed in {elapsed:.2f}s, {cells / elapsed / 1e6:.2f}M cells/s, "
+          f"{sum(row.itemsize * len(row) for row in costs) / 2 ** 20:.1f} MiB of costs")
+
+
+def bench_mmap_child(args):
+    """Runs one method in a fresh process and prints its peak RSS in KiB."""
+    start = time.perf_counter()
+    if args.mode == "lists":
+        # The original path: Python lists of ints, one row per line
+        with open(args.path) as stream:
+            supply = list(map(int, stream.readline().split()))
+            demand = list(map(int, stream.readline().split()))
+            costs = [list(map(int, stream.readline().split())) for _ in supply]
+    else:
+        supply, demand, costs = load_problem(args.path, "binary")
+    solver = BalancedProlemSolver(supply, demand, costs)
+    total_cost = solution_cost(costs, METHODS[args.method](solver))
+    elapsed = time.perf_counter() - start
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, total_cost, f"{elapsed:.3f}")
+
+
+def bench_mmap(args):
+    """Peak RSS of the list-of-lists path vs. the memory-mapped binary format."""
+    supply, demand, _ = random_problem(args.size, args.size, args.seed, max_cost=None)
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, "problem.txt")
+        binary_path = os.path.join(directory, "problem" + BINARY_EXTENSION)
+        with open(text_path, 'w') as stream:
+            write_problem(stream, supply, demand, [])
+            for _ in range(args.size):
+                stream.write(' '.join(str(rng.randint(1, 1000)) for _ in range(args.size)) + '\n')
+
+        start = time.perf_counter()
+        convert_to_binary(text_path, binary_path)
+        print(f"{args.size}x{args.size}: converted to binary in {time.perf_counter() - start:.2f}s")
+
+        for mode in ("lists", "mmap"):
+            output = subprocess.run(
+                [sys.executable, __file__, "mmap-child", mode, text_path if mode == "lists" else binary_path,
+                 "--method", args.method],
+                check=True, capture_output=True, text=True,
+            ).stdout.split()
+            rss, total_cost, elapsed = output[-3:]
+            print(f"{mode:>6}: peak RSS {int(rss) / 1024:8.1f} MiB, {args.method} total cost {total_cost}, {elapsed}s")
+
+
+def bench_nw(args):
+    """O(m + n) North-West corner with compact output on a large problem (no costs needed)."""
+    supply, demand, _ = random_problem(args.size, args.size, args.seed, max_cost=None)
+    start = time.perf_counter()
+    cells = north_west_corner(supply, demand)
+    elapsed = time.perf_counter() - start
+
+    # Second run for memory, tracemalloc slows the loop down
+    tracemalloc.start()
+    north_west_corner(supply, demand)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{args.size}x{args.size}: {len(cells)} basic cells in {elapsed:.3f}s, "
+          f"peak allocation {peak / 2 ** 20:.1f} MiB (a dense solution would hold {args.size ** 2:,} cells)")
+
+
+def bench_validate(args):
+    """Constructor validation vs. the original per-cell scans and vs. solve time."""
+    supply, demand, costs = random_problem(args.size, args.size, args.seed)
+
+    start = time.perf_counter()
+    solver = BalancedProlemSolver(supply, demand, costs, validate=False)
+    solver.is_degenerate() or solver.has_zero_or_negative_costs() or not solver.is_balanced()
+    scans = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solver = BalancedProlemSolver(supply, demand, costs)
+    validation = time.perf_counter() - start
+
+    start = time.perf_counter()
+    METHODS[args.method](solver)
+    solve = time.perf_counter() - start
+
+    print(f"{args.size}x{args.size}: original scans {scans:.3f}s, validate_problem {validation:.3f}s, "
+          f"{args.method} solve {solve:.3f}s (validation = {100 * validation / solve:.1f}% of solve)")
+
+
+def bench_session(args):
+    """Re-solve latency of a `SolverSession` after one edit vs. a fresh solver."""
+    supply, demand, costs = random_problem(args.size, args.size, args.seed)
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    session = SolverSession(supply, demand, costs)
+    session.solve(args.method)
+    print(f"{args.size}x{args.size} {args.method}: session setup + first solve {time.perf_counter() - start:.3f}s")
+
+    edits = {
+        "cost": lambda i, j: session.set_cost(i, j, rng.randint(1, 100)),
+        "supply/demand": lambda i, j: (session.add_supply(i, 10), session.add_demand(j, 10)),
+    }
+    for name, edit in edits.items():
+        edit(rng.randrange(args.size), rng.randrange(args.size))
+        start = time.perf_counter()
+        result = session.solve(args.method)
+        resolve = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fresh = METHODS[args.method](BalancedProlemSolver(session.supply, session.demand, session.costs))
+        scratch = time.perf_counter() - start
+        same = sorted((i, j, q) for i, j, q in result.cells()) == \
+            [(i, j, q) for i, row in enumerate(fresh) for j, q in enumerate(row) if q]
+        print(f"  {name + ' edit':<18}: re-solve {resolve:.3f}s, from scratch {scratch:.3f}s "
+              f"({scratch / resolve:.1f}x), same solution: {same}")
+
+
+def bench_index(args):
+    """`CostIndex` build time and size vs. the solves that share it."""
+    print(f"{'size':>10} | {'build s':>8} | {'index MiB':>9} | {'vogel s':>8} | {'russell s':>9} | "
+          f"{'reuse s':>8}")
+    for size in args.sizes:
+        supply, demand, costs = random_problem(size, size, args.seed)
+        index = CostIndex(costs)
+        solver = BalancedProlemSolver(supply, demand, costs, validate=False, cost_index=index)
+        times = []
+        for method in ("vogel", "russell"):
+            start = time.perf_counter()
+            METHODS[method](solver)
+            times.append(time.perf_counter() - start)
+
+        # Same costs, other quantities: only the solve is paid again
+        supply, demand, _ = random_problem(size, size, args.seed + 1, max_cost=None)
+        start = time.perf_counter()
+        METHODS["vogel"](BalancedProlemSolver(supply, demand, costs, validate=False, cost_index=index))
+        reuse = time.perf_counter() - start
+        print(f"{f'{size}x{size}':>10} | {index.build_time:>8.3f} | {index.nbytes / 2 ** 20:>9.1f} | "
+              f"{times[0]:>8.3f} | {times[1]:>9.3f} | {reuse:>8.3f}")
+
+
+def bench_cache(args):
+    """Resubmitted instances through a `ResultCache`: fingerprint, miss and hit latency."""
+    instances = [random_problem(args.size, args.size, args.seed + k) for k in range(args.instances)]
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(max_bytes=args.max_mib << 20, directory=directory)
+        start = time.perf_counter()
+        for supply, demand, costs in instances:
+            fingerprint(supply, demand, costs)
+        hashing = (time.perf_counter() - start) / len(instances)
+
+        rounds = {}
+        for name in ("miss", "hit"):
+            start = time.perf_counter()
+            for supply, demand, costs in instances:
+                solver = BalancedProlemSolver(supply, demand, costs, validate=False)
+                key = fingerprint(supply, demand, costs)
+                for method in METHODS:
+                    cache.solve(solver, method, key)
+            rounds[name] = (time.perf_counter() - start) / len(instances)
+
+        # Another process only sees the disk tier
+        cold = ResultCache(max_bytes=args.max_mib << 20, directory=directory)
+        start = time.perf_counter()
+        for supply, demand, costs in instances:
+            solver = BalancedProlemSolver(supply, demand, costs, validate=False)
+            key = fingerprint(supply, demand, costs)
+            for method in METHODS:
+                cold.solve(solver, method, key)
+        rounds["disk hit"] = (time.perf_counter() - start) / len(instances)
+
+    print(f"{args.instances} instances {args.size}x{args.size}, fingerprint {1000 * hashing:.2f} ms/instance")
+    for name, seconds in rounds.items():
+        print(f"  {name:<8}: {1000 * seconds:8.2f} ms/instance (all methods)")
+    print(f"  memory tier: {cache.stats()}")
+    print(f"  disk tier:   {cold.stats()}")
+
+
+def bench_service(args):
+    """Load test of an in-process `SolveService`; `--distinct` < `--requests` exercises coalescing."""
+    problems = [random_problem(args.size, args.size, args.seed + k) for k in range(args.distinct)]
+
+    async def run():
+        service = SolveService(args.workers, args.queue_size)
+        server = await service.serve(port=args.port)
+        try:
+            return service, await load_test(problems, port=args.port, requests=args.requests,
+                                            concurrency=args.concurrency)
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.close()
+
+    service, stats = asyncio.run(run())
+    print(f"{stats['requests']} requests ({args.distinct} distinct {args.size}x{args.size}) over "
+          f"{args.concurrency} connections, {service.workers or os.cpu_count()} workers")
+    print(f"  {stats['throughput']:.1f} req/s, p50 {1000 * stats['p50']:.1f} ms, p99 {1000 * stats['p99']:.1f} ms")
+    print(f"  jobs {service.requests}, solved {service.solved}, coalesced {service.coalesced}")
+
+
+def bench_portfolio(args):
+    """Portfolio of every method in parallel processes vs. running them one after the other."""
+    print(f"{'size':>10} | {'sequential s':>12} | {'portfolio s':>11} | {'winner':<8} | per-method wall s")
+    for size in args.sizes:
+        supply, demand, costs = random_problem(size, size, args.seed)
+        solver = BalancedProlemSolver(supply, demand, costs)
+        start = time.perf_counter()
+        for method in METHODS:
+            BalancedProlemSolver(supply, demand, costs, validate=False).solve(method)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        outcome = run_portfolio(solver, budget=args.budget)
+        elapsed = time.perf_counter() - start
+        walls = ", ".join(f"{method} {outcome.wall_times[method]:.3f}" if method in outcome.wall_times
+                          else f"{method} cancelled" for method in METHODS)
+        print(f"{f'{size}x{size}':>10} | {sequential:>12.3f} | {elapsed:>11.3f} | {outcome.winner or '-':<8} | {walls}")
+
+
+def _private_mib():
+    # Resident memory of this process that is not shared with others (Linux)
+    with open("/proc/self/smaps_rollup") as stream:
+        fields = dict(line.split(":", 1) for line in stream if ":" in line)
+    return sum(int(fields[key].split()[0]) for key in ("Private_Clean", "Private_Dirty")) / 1024
+
+
+_worker_costs = _worker_index = _worker_matrix = None
+_worker_ready = 0.0
+PROBE_PAUSE = 0.2  # seconds every probe waits, so that each worker answers one
+
+
+def _load_pickled_worker(costs):
+    # Pool initializer: the costs arrive pickled and every worker sorts its own index
+    global _worker_costs, _worker_index, _worker_ready
+    start = time.perf_counter()
+    _worker_costs, _worker_index = costs, CostIndex(costs)
+    _worker_ready = time.perf_counter() - start
+
+
+def _attach_shared_worker(name):
+    # Pool initializer: the worker maps the block, nothing is copied
+    global _worker_costs, _worker_index, _worker_matrix, _worker_ready
+    start = time.perf_counter()
+    _worker_matrix = SharedCostMatrix.attach(name)
+    _worker_costs, _worker_index = _worker_matrix.costs, _worker_matrix.cost_index
+    _worker_ready = time.perf_counter() - start
+
+
+def _probe_worker(scenario):
+    supply, demand, method = scenario
+    if method == "nw":
+        cells = north_west_corner(supply, demand)
+    else:
+        engine = indexed_vogel if method == "vogel" else indexed_russell
+        cells = list(engine(supply, demand, *_worker_index))
+    total_cost = sum(_worker_costs[i][j] * q for i, j, q in cells)
+    time.sleep(PROBE_PAUSE)
+    return os.getpid(), _worker_ready, _private_mib(), total_cost
+
+
+def bench_shared(args):
+    """Worker startup and private memory: cost matrix pickled to every worker vs. shared memory."""
+    rng = random.Random(args.seed)
+    values = range(1, args.max_cost + 1)
+    costs = [array('q', rng.choices(values, k=args.size)) for _ in range(args.size)]
+    supply, demand, _ = random_problem(args.size, args.size, args.seed, max_cost=None)
+    scenario = (supply, demand, args.method)
+
+    start = time.perf_counter()
+    matrix = SharedCostMatrix.create(costs)
+    print(f"{args.size}x{args.size}: shared block {matrix.nbytes / 2 ** 20:.1f} MiB "
+          f"({matrix.typecode} costs + orders) created in {time.perf_counter() - start:.3f}s")
+
+    # Spawned workers, so nothing is inherited from this process by fork
+    context = multiprocessing.get_context("spawn")
+    modes = {
+        "pickled": (args.pickled_workers, _load_pickled_worker, (costs,)),
+        "shared": (args.workers, _attach_shared_worker, (matrix.name,)),
+    }
+    print(f"{'mode':>8} | {'workers':>7} | {'startup s':>9} | {'ready s/worker':>14} | "
+          f"{'private MiB/worker':>18} | {'total MiB':>9}")
+    try:
+        for mode, (workers, initializer, initargs) in modes.items():
+            if not workers:
+                continue
+            start = time.perf_counter()
+            with context.Pool(workers, initializer=initializer, initargs=initargs) as pool:
+                answers = pool.map(_probe_worker, [scenario] * workers, chunksize=1)
+            answers = list({pid: answer for pid, *answer in answers}.values())
+            rounds = -(-workers // len(answers))
+            elapsed = time.perf_counter() - start - PROBE_PAUSE * rounds
+            if len({total for *_, total in answers}) != 1:
+                raise AssertionError(f"{mode} workers disagree on the total cost")
+            ready = sum(answer[0] for answer in answers) / len(answers)
+            private = sum(answer[1] for answer in answers) / len(answers)
+            print(f"{mode:>8} | {workers:>7} | {elapsed:>9.3f} | {ready:>14.3f} | {private:>18.1f} | "
+                  f"{private * workers:>9.1f}")
+    finally:
+        matrix.close()
+        matrix.unlink()
+
+
+def bench_sweep(args):
+    """Scenarios/sec of a `Sweep` vs. one `BalancedProlemSolver` per scenario."""
+    _, _, costs = random_problem(args.size, args.size, args.seed)
+    scenarios = [random_problem(args.size, args.size, args.seed + k, max_cost=None)[:2] for k in range(args.scenarios)]
+
+    start = time.perf_counter()
+    expected = [[BalancedProlemSolver(supply, demand, costs).solve(method).total_cost for method in args.methods]
+                for supply, demand in scenarios]
+    independent = time.perf_counter() - start
+    print(f"{args.size}x{args.size}, {args.scenarios} scenarios, {' '.join(args.methods)}")
+    print(f"  independent solves : {independent:8.3f}s ({args.scenarios / independent:8.1f} scenarios/s)")
+
+    for processes in args.processes:
+        start = time.perf_counter()
+        with Sweep(costs, args.methods, processes) as sweep:
+            totals = {}
+            for results in sweep.run(scenarios):
+                totals[results[0].index] = [result.total_cost for result in results]
+        elapsed = time.perf_counter() - start
+        if [totals[k] for k in range(args.scenarios)] != expected:
+            raise AssertionError("The sweep disagrees with the independent solves")
+        print(f"  sweep, {processes:>2} processes: {elapsed:8.3f}s ({args.scenarios / elapsed:8.1f} scenarios/s, "
+              f"{independent / elapsed:.1f}x)")
+    sweep.print_summary()
+
+
+def bench_anytime(args):
+    """
+    Stage reached, plan cost and deadline overshoot (wall time when `anytime_solve`
+    returns, past the budget) of anytime solves under each budget.
+    """
+    print(f"{'size':>9} | {'budget':>6} | {'stage':>10} | {'pivots':>6} | {'updates':>7} | {'total cost':>12} | "
+          f"{'elapsed':>8} | {'over':>7}")
+    for size in args.sizes:
+        supply, demand, costs = random_problem(size, size, args.seed)
+        for budget in args.budgets:
+            # A fresh solver per run, so no run reuses the cost index built by another
+            solver = BalancedProlemSolver(supply, demand, costs)
+            updates = []
+            start = time.perf_counter()
+            result = anytime_solve(solver, budget, args.methods, updates.append, args.pause_gc)
+            elapsed = time.perf_counter() - start
+            print(f"{size:>4}x{size:<4} | {budget:>6.2f} | {result.stage:>10} | {result.pivots:>6} | {len(updates):>7} | "
+                  f"{result.total_cost:>12} | {elapsed:>7.3f}s | {1000 * max(0.0, elapsed - budget):>5.1f}ms")
+
+
+def bench_dtypes(args):
+    """Narrowest-typecode cost rows vs. lists of Python ints: memory, validation and solve time."""
+    supply, demand, _ = random_problem(args.size, args.size, args.seed, max_cost=None)
+    rng = random.Random(args.seed)
+    values = range(1, args.max_cost + 1)
+    source = [array('q', rng.choices(values, k=args.size)) for _ in range(args.size)]
+
+    representations = {
+        "lists": lambda: [row.tolist() for row in source],
+        "compact": lambda: compact_costs(source),
+    }
+    for name, build in representations.items():
+        tracemalloc.start()
+        costs = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        solver = BalancedProlemSolver(supply, demand, costs)
+        validation = time.perf_counter() - start
+        start = time.perf_counter()
+        result = solver.solve(args.method)
+        typecode = costs[0].typecode if isinstance(costs[0], array) else "int"
+        print(f"{name:>8} ({typecode:>3}): {size / 2 ** 20:8.1f} MiB, validate {validation:.3f}s, "
+              f"{args.method} {time.perf_counter() - start:.3f}s, total cost {result.total_cost}")
+        del costs, solver, result
+
+
+def bench_outofcore(args):
+    """Out-of-core Vogel/Russell vs. the in-memory methods on a mapped binary file."""
+    supply, demand, _ = random_problem(args.size, args.size, args.seed, max_cost=None)
+    rng = random.Random(args.seed)
+    values = range(1, args.max_cost + 1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "problem" + BINARY_EXTENSION)
+        write_binary(path, supply, demand, (array('q', rng.choices(values, k=args.size)) for _ in range(args.size)))
+        print(f"{args.size}x{args.size}, {os.path.getsize(path) / 2 ** 20:.1f} MiB file")
+
+        def in_memory(method):
+            with open_binary(path) as problem:
+                return BalancedProlemSolver(problem.supply, problem.demand, problem.costs).solve(method).total_cost
+
+        for method in args.methods:
+            runs = {"in memory": lambda: in_memory(method)}
+            for block_rows in args.block_rows:
+                runs[f"blocks of {block_rows}"] = lambda rows=block_rows: solve_out_of_core(path, method, rows)
+            for name, run in runs.items():
+                start = time.perf_counter()
+                result = run()
+                elapsed = time.perf_counter() - start
+                tracemalloc.start()
+                run()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                total = result if name == "in memory" else result.total_cost
+                read = "" if name == "in memory" else \
+                    f", read {result.bytes_read / 2 ** 20:.1f} MiB in {result.blocks_read} blocks"
+                print(f"  {method:<8} {name:<15}: {elapsed:7.3f}s, peak {peak / 2 ** 20:7.1f} MiB, "
+                      f"total cost {total}{read}")
+
+
+# Methods of the suite: the library ones plus the original per-iteration implementations
+SUITE_METHODS = dict(METHODS, **{
+    "vogel-classic": lambda solver: solver.vogels_approximation_method(),
+    "russell-classic": lambda solver: solver.russells_approximation_method(),
+    "least_cost-classic": lambda solver: solver.least_cost_method(),
+})
+
+
+class _IterationCounter(Sink):
+    # Counts the iterations of every method without keeping their events
+    def __init__(self):
+        self.iterations = 0
+
+    def emit(self, event):
+        self.iterations += 1
+
+
+def run_case(distribution, size, method, seed, memory):
+    """Solves one generated instance; returns the record stored in the results file."""
+    supply, demand, costs = random_problem(size, size, seed, distribution=distribution)
+    solver = BalancedProlemSolver(supply, demand, costs)
+
+    start = time.perf_counter()
+    solution = SUITE_METHODS[method](solver)
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        # Separate run on a fresh solver (tracemalloc slows the methods down, and the
+        # timed run left the cost index cached on `solver`)
+        fresh = BalancedProlemSolver(supply, demand, costs)
+        tracemalloc.start()
+        SUITE_METHODS[method](fresh)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    # Separate run too: a step may allocate 0 (degenerate instances), so the nonzero
+    # cells of the solution undercount the iterations
+    counter = _IterationCounter()
+    SUITE_METHODS[method](BalancedProlemSolver(supply, demand, costs, sink=counter))
+
+    return {
+        "distribution": distribution,
+        "size": size,
+        "method": method,
+        "seed": seed,
+        "seconds": seconds,
+        "peak_bytes": peak,
+        "iterations": counter.iterations,
+        "objective": solution_cost(costs, solution),
+    }
+
+
+def bench_suite(args):
+    """Runs every method on every distribution and size and writes the records as JSON."""
+    records = []
+    print(f"{'distribution':<10} | {'size':>10} | {'method':<16} | {'seconds':>9} | {'peak MiB':>8} | "
+          f"{'iters':>7} | {'objective':>12}")
+    for distribution in args.distributions:
+        for method in args.methods:
+            for size in args.sizes:
+                record = run_case(distribution, size, method, args.seed, not args.no_memory)
+                records.append(record)
+                peak = "-" if record["peak_bytes"] is None else f"{record['peak_bytes'] / 2 ** 20:.1f}"
+                print(f"{distribution:<10} | {f'{size}x{size}':>10} | {method:<16} | {record['seconds']:>9.3f} | "
+                      f"{peak:>8} | {record['iterations']:>7} | {record['objective']:>12}")
+                if record["seconds"] > args.max_seconds:
+                    break  # larger sizes would only take longer
+
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "records": records,
+    }
+    with open(args.output, 'w') as stream:
+        json.dump(results, stream, indent=1)
+    print(f"Results written to {args.output}")
+
+
+def bench_compare(args):
+    """Compares two results files and flags slower cases and changed objectives."""
+    def load(path):
+        with open(path) as stream:
+            records = json.load(stream)["records"]
+        return {(r["distribution"], r["size"], r["method"], r["seed"]): r for r in records}
+
+    baseline, current = load(args.baseline), load(args.current)
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key], current[key]
+        ratio = new["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        flags = []
+        if ratio > 1 + args.threshold and new["seconds"] - old["seconds"] > args.min_seconds:
+            flags.append(f"SLOWER x{ratio:.2f}")
+        if old["peak_bytes"] and new["peak_bytes"] and new["peak_bytes"] > (1 + args.threshold) * old["peak_bytes"]:
+            flags.append(f"MEMORY x{new['peak_bytes'] / old['peak_bytes']:.2f}")
+        if new["objective"] != old["objective"]:
+            flags.append(f"OBJECTIVE {old['objective']} -> {new['objective']}")
+        regressions += bool(flags)
+        distribution, size, method, _ = key
+        print(f"{distribution:<10} | {f'{size}x{size}':>10} | {method:<16} | {old['seconds']:>9.3f} -> "
+              f"{new['seconds']:>9.3f} | {' '.join(flags) or 'ok'}")
+
+    missing = baseline.keys() - current.keys()
+    if missing:
+        print(f"{len(missing)} cases of the baseline are missing in {args.current}")
+    print(f"{regressions} regression(s)")
+    if regressions:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the transportation problem methods")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    modi = commands.add_parser("modi", help="MODI warm-started from NW, Vogel and Russell")
+    modi.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 200])
+    modi.add_argument("--seed", type=int, default=0)
+    modi.set_defaults(run=bench_modi)
+
+    batch = commands.add_parser("batch", help="Batch API throughput on a process pool")
+    batch.add_argument("--instances", type=int, default=64)
+    batch.add_argument("--size", type=int, default=60)
+    batch.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    batch.add_argument("--chunksize", type=int, default=4)
+    batch.add_argument("--seed", type=int, default=0)
+    batch.set_defaults(run=bench_batch)
+
+
+    parse = commands.add_parser("parse", help="Bulk parsing of a problem file")
+    parse.add_argument("--size", type=int, default=5000)
+    parse.add_argument("--format", choices=["text", "csv"], default="text")
+    parse.add_argument("--seed", type=int, default=0)
+    parse.set_defaults(run=bench_parse)
+
+    mapped = commands.add_parser("mmap", help="Peak RSS of list-of-lists vs. memory-mapped input")
+    mapped.add_argument("--size", type=int, default=3000)
+    mapped.add_argument("--method", choices=list(METHODS), default="nw")
+    mapped.add_argument("--seed", type=int, default=0)
+    mapped.set_defaults(run=bench_mmap)
+
+    mapped_child = commands.add_parser("mmap-child")
+    mapped_child.add_argument("mode", choices=["lists", "mmap"])
+    mapped_child.add_argument("path")
+    mapped_child.add_argument("--method", choices=list(METHODS), default="nw")
+    mapped_child.set_defaults(run=bench_mmap_child)
+
+    north_west = commands.add_parser("nw", help="O(m + n) North-West corner with compact output")
+    north_west.add_argument("--size", type=int, default=100_000)
+    north_west.add_argument("--seed", type=int, default=0)
+    north_west.set_defaults(run=bench_nw)
+
+    validate = commands.add_parser("validate", help="Constructor validation overhead")
+    validate.add_argument("--size", type=int, default=4000)
+    validate.add_argument("--method", choices=list(METHODS), default="vogel")
+    validate.add_argument("--seed", type=int, default=0)
+    validate.set_defaults(run=bench_validate)
+
+    cost_index = commands.add_parser("index", help="Cost index build time and memory vs. solve time")
+    cost_index.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 2000])
+    cost_index.add_argument("--seed", type=int, default=0)
+    cost_index.set_defaults(run=bench_index)
+
+    cached = commands.add_parser("cache", help="Result cache hit/miss latency and counters")
+    cached.add_argument("--instances", type=int, default=20)
+    cached.add_argument("--size", type=int, default=200)
+    cached.add_argument("--max-mib", type=int, default=64, help="memory tier bound")
+    cached.add_argument("--seed", type=int, default=0)
+    cached.set_defaults(run=bench_cache)
+
+    served = commands.add_parser("service", help="Load test of the asyncio solve service")
+    served.add_argument("--requests", type=int, default=200)
+    served.add_argument("--distinct", type=int, default=8, help="distinct problems among the requests")
+    served.add_argument("--size", type=int, default=50)
+    served.add_argument("--concurrency", type=int, default=16)
+    served.add_argument("--workers", type=int)
+    served.add_argument("--queue-size", type=int, default=64)
+    served.add_argument("--port", type=int, default=8765)
+    served.add_argument("--seed", type=int, default=0)
+    served.set_defaults(run=bench_service)
+
+    portfolio = commands.add_parser("portfolio", help="Every method in parallel processes, cheapest plan wins")
+    portfolio.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000])
+    portfolio.add_argument("--budget", type=float, help="seconds before slower methods are cancelled")
+    portfolio.add_argument("--seed", type=int, default=0)
+    portfolio.set_defaults(run=bench_portfolio)
+
+    dtypes = commands.add_parser("dtypes", help="Compact cost typecodes vs. lists of Python ints")
+    dtypes.add_argument("--size", type=int, default=3000)
+    dtypes.add_argument("--max-cost", type=int, default=1000)
+    dtypes.add_argument("--method", choices=list(METHODS), default="vogel")
+    dtypes.add_argument("--seed", type=int, default=0)
+    dtypes.set_defaults(run=bench_dtypes)
+
+    out_of_core = commands.add_parser("outofcore", help="Block-by-block Vogel/Russell from a binary file")
+    out_of_core.add_argument("--size", type=int, default=1000)
+    out_of_core.add_argument("--max-cost", type=int, default=1000)
+    out_of_core.add_argument("--methods", nargs="+", choices=["nw", "vogel", "russell"], default=["vogel", "russell"])
+    out_of_core.add_argument("--block-rows", type=int, nargs="+", default=[16, 128])
+    out_of_core.add_argument("--seed", type=int, default=0)
+    out_of_core.set_defaults(run=bench_outofcore)
+
+    shared = commands.add_parser("shared", help="Worker startup and memory with a cost matrix in shared memory")
+    shared.add_argument("--size", type=int, default=4000)
+    shared.add_argument("--max-cost", type=int, default=1000)
+    shared.add_argument("--workers", type=int, default=16)
+    shared.add_argument("--pickled-workers", type=int, default=2,
+                        help="workers of the pickled baseline (each holds a full copy; 0 to skip)")
+    shared.add_argument("--method", choices=list(METHODS), default="nw", help="method every worker runs once")
+    shared.add_argument("--seed", type=int, default=0)
+    shared.set_defaults(run=bench_shared)
+
+    swept = commands.add_parser("sweep", help="Many supply/demand scenarios against one cost matrix")
+    swept.add_argument("--size", type=int, default=300)
+    swept.add_argument("--scenarios", type=int, default=200)
+    swept.add_argument("--methods", nargs="+", choices=list(METHODS), default=["vogel"])
+    swept.add_argument("--processes", type=int, nargs="+", default=[0, 2])
+    swept.add_argument("--seed", type=int, default=0)
+    swept.set_defaults(run=bench_sweep)
+
+    anytime = commands.add_parser("anytime", help="Stage reached and plan cost of anytime solves under a time budget")
+    anytime.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 500, 1000])
+    anytime.add_argument("--budgets", type=float, nargs="+", default=[0.05, 0.2, 1.0])
+    anytime.add_argument("--methods", nargs="+", choices=list(ENGINES), default=["vogel", "russell"])
+    anytime.add_argument("--seed", type=int, default=0)
+    anytime.add_argument("--pause-gc", action="store_true", help="pause the cyclic garbage collector during the solves")
+    anytime.set_defaults(run=bench_anytime)
+
+    resolve = commands.add_parser("session", help="Re-solve after a single edit with a SolverSession")
+    resolve.add_argument("--size", type=int, default=2000)
+    resolve.add_argument("--method", choices=list(METHODS), default="vogel")
+    resolve.add_argument("--seed", type=int, default=0)
+    resolve.set_defaults(run=bench_session)
+
+    suite = commands.add_parser("suite", help="Every method on generated instances, results saved as JSON")
+    suite.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500, 1000])
+    suite.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    suite.add_argument("--methods", nargs="+", choices=list(SUITE_METHODS), default=list(METHODS))
+    suite.add_argument("--seed", type=int, default=0)
+    suite.add_argument("--max-seconds", type=float, default=60.0,
+                       help="skip larger sizes of a method once a run took longer than this")
+    suite.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    suite.add_argument("--output", default="bench_results.json")
+    suite.set_defaults(run=bench_suite)
+
+    compare = commands.add_parser("compare", help="Flags regressions between two suite results")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10, help="relative slowdown to flag")
+    compare.add_argument("--min-seconds", type=float, default=0.005, help="ignore smaller absolute slowdowns")
+    compare.set_defaults(run=bench_compare)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
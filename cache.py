@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import time
+from array import array
+from collections import OrderedDict
+
+from report import SolveResult
+
+
+def _update(digest, values):
+    # Integers are hashed as 'q' and fractional values as 'd', whatever the container
+    if not (isinstance(values, array) and values.typecode == 'q'
+            or isinstance(values, memoryview) and values.format == 'q'):
+        try:
+            try:
+                values = array('q', values)
+            except TypeError:
+                values = array('d', values)
+        except OverflowError:
+            # Values beyond int64 stay Python ints (see `dtypes`): hashed as their decimal
+            # text, behind a tag and the length so the encoding cannot collide with another
+            digest.update(f"i{len(values)}:{','.join(map(str, values))}".encode())
+            return
+    digest.update(values.typecode.encode() if isinstance(values, array) else b'q')
+    digest.update(values)
+
+
+def fingerprint(supply, demand, costs) -> str:
+    """
+    Content hash of a problem, as a hex string.
+
+    Rows are fed to BLAKE2b as their machine representation, so equal problems stored as
+    lists, `array`s or memory-mapped rows get the same fingerprint.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{len(supply)}x{len(demand)}".encode())
+    _update(digest, supply)
+    _update(digest, demand)
+    for row in costs:
+        _update(digest, row)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Results of `BalancedProlemSolver.solve` keyed on the problem `fingerprint` and the method.
+
+    - `max_bytes` Bound on the serialized size of the entries kept in memory; the least
+      recently used ones are evicted first.
+    - `directory` Optional on-disk tier: every entry is also written there as JSON, and
+      memory misses are looked up there before solving (so other processes share it).
+
+    `hits`, `disk_hits`, `misses` and `evictions` count the lookups; see `stats()`.
+    """
+    def __init__(self, max_bytes: int = 64 << 20, directory: str = None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.size = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()  # key -> (entry, size)
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.size, "hits": self.hits,
+                "disk_hits": self.disk_hits, "misses": self.misses, "evictions": self.evictions}
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _remember(self, key, entry, size):
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (entry, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted
+            self.evictions += 1
+
+    def get(self, key: str):
+        """Cached entry (`{"shape", "cells", "total_cost"}`) or None."""
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached[0]
+        if self.directory is not None:
+            try:
+                with open(self._path(key), 'rb') as stream:
+                    data = stream.read()
+            except FileNotFoundError:
+                pass
+            else:
+                entry = json.loads(data)
+                self._remember(key, entry, len(data))
+                self.disk_hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def put(self, key: str, entry: dict):
+        try:
+            data = json.dumps(entry, separators=(',', ':')).encode()
+        except TypeError:
+            return  # e.g. `Fraction` quantities, which JSON cannot store exactly
+        if key in self._entries:
+            self.size -= self._entries.pop(key)[1]
+        self._remember(key, entry, len(data))
+        if self.directory is not None:
+            # Write then rename, so a concurrent reader never sees a partial file
+            temporary = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(temporary, 'wb') as stream:
+                stream.write(data)
+            os.replace(temporary, self._path(key))
+
+    def solve(self, solver, method: str, problem_key: str = None) -> SolveResult:
+        """
+        `solver.solve(method)`, answered from the cache when the same problem was solved before.
+
+        - `problem_key` `fingerprint` of the solver's problem, to hash it only once for several methods.
+        """
+        start = time.perf_counter()
+        problem_key = problem_key or fingerprint(solver.supply, solver.demand, solver.costs)
+        key = f"{problem_key}-{method}"
+        entry = self.get(key)
+        if entry is None:
+            result = solver.solve(method)
+            cells = [[i, j, q] for i, row in enumerate(result.solution) for j, q in enumerate(row) if q]
+            self.put(key, {"shape": [len(solver.supply), len(solver.demand)], "cells": cells,
+                           "total_cost": result.total_cost})
+            return result
+
+        m, n = entry["shape"]
+        solution = [[0] * n for _ in range(m)]
+        for i, j, quantity in entry["cells"]:
+            solution[i][j] = quantity
+        return SolveResult(method, solution, solver.costs, time.perf_counter() - start,
+                           solver.dummy_flow(solution), entry["total_cost"])
@@ -1,28 +1,123 @@
+import argparse
+import heapq
+import itertools
+import sys
+import time
+
+from cache import ResultCache, fingerprint
+from instrumentation import HistogramSink, IterationEvent
+from modi import modi_method
+from report import FULL, SILENT, SUMMARY, Report, SolveResult
+from validation import (
+    InfeasibleProblemError, NotApplicableError, NotBalancedError, TransportationProblemError, validate_problem,
+)
+
+
 class BalancedProlemSolver:
-    def __init__(self, supply: list[int], demand: list[int], cost: list[list[int]]):
+    def __init__(self, supply: list[int], demand: list[int], cost: list[list[int]], validate: bool = True,
+                 auto_balance: bool = False, dummy_cost=0, sink=None, cost_index=None):
+        """
+        - `validate` Run `validate_problem` and raise `NotApplicableError`/`NotBalancedError`
+          for invalid problems. Pass False for inputs that were validated before;
+          `validation` is None then.
+        - `auto_balance` Balance an unbalanced problem with a dummy destination (excess supply)
+          or a dummy source (excess demand) whose lanes cost `dummy_cost`. The dummy line is
+          the last row/column of `supply`/`demand`, `costs` and the solutions; see `dummy_flow`.
+        - `sink` `instrumentation.Sink` receiving an `IterationEvent` for every allocation of
+          every method. Without a sink nothing is measured.
+        - `cost_index` `CostIndex` of the same cost matrix (e.g. `other_solver.cost_index`),
+          to solve it again with different supply/demand without re-sorting it.
+        """
         self.balanced = True 
         self.supply = supply
         self.demand = demand
         self.costs = cost
-        
-        if self.is_degenerate() or self.has_zero_or_negative_costs():
-            print("The method is not applicable!")
-            exit(0)
-
-        if not self.is_balanced():
+        self.validation = None
+        self.dummy = None  # "row" or "column" once balanced with a dummy line
+        self.sink = sink
+
+        if validate:
+            self.validation = validate_problem(supply, demand, cost)
+            if not self.validation.applicable:
+                raise NotApplicableError()
+            if dummy_cost < 0:
+                raise NotApplicableError("The dummy cost must not be negative")
+
+        excess = sum(supply) - sum(demand)
+        if excess and auto_balance:
+            self.costs = DummyLineCosts(cost, len(supply), len(demand), excess < 0, dummy_cost)
+            if excess > 0:
+                self.dummy = "column"
+                self.demand = list(demand) + [excess]
+            else:
+                self.dummy = "row"
+                self.supply = list(supply) + [-excess]
+        elif excess:
             self.balanced = False
-            print("The problem is not balanced!")
-            exit(0)
+            if validate:
+                raise NotBalancedError()
+
+        if cost_index is not None and cost_index.shape != (len(self.supply), len(self.demand)):
+            raise NotApplicableError(f"The cost index is {cost_index.shape[0]}x{cost_index.shape[1]}, "
+                                     f"the problem is {len(self.supply)}x{len(self.demand)}")
+        self._cost_index = cost_index
+        self._partial_index = None
+
+    @property
+    def cost_index(self) -> "CostIndex":
+        """Sorted row/column orders of `costs`, built on first use and shared by the incremental methods."""
+        return self.build_cost_index()
+
+    def build_cost_index(self, deadline: float = None) -> "CostIndex":
+        """
+        `cost_index`, built now if needed. Past `deadline` (a `time.perf_counter()` value)
+        the build raises `TimeoutError`; the lines sorted so far stay on the solver, so the
+        next build resumes from them and the timeout frees nothing.
+        """
+        if self._cost_index is None:
+            if self._partial_index is None:
+                self._partial_index = ([], [], [], [])
+            self._cost_index = CostIndex(self.costs, deadline, self._partial_index)
+            self._partial_index = None
+        return self._cost_index
+
+    def dummy_flow(self, solution):
+        """Quantity shipped to the dummy line, for a solution matrix or `(row, col, quantity)` cells."""
+        if self.dummy is None:
+            return 0
+        m, n = len(self.supply), len(self.demand)
+        if solution and isinstance(solution[0], tuple):
+            if self.dummy == "row":
+                return sum(quantity for i, _, quantity in solution if i == m - 1)
+            return sum(quantity for _, j, quantity in solution if j == n - 1)
+        if self.dummy == "row":
+            return sum(solution[m - 1])
+        return sum(row[n - 1] for row in solution)
+
+    def without_dummy(self, solution):
+        """Drops the dummy line from a solution matrix or from `(row, col, quantity)` cells."""
+        if self.dummy is None:
+            return solution
+        m, n = len(self.supply), len(self.demand)
+        if solution and isinstance(solution[0], tuple):
+            if self.dummy == "row":
+                return [cell for cell in solution if cell[0] != m - 1]
+            return [cell for cell in solution if cell[1] != n - 1]
+        if self.dummy == "row":
+            return solution[:m - 1]
+        return [row[:n - 1] for row in solution]
 
     # Function to calculate penalties (Vogel's)
-    def calculate_penalties(self):
+    def calculate_penalties(self, supply=None, demand=None):
+        if supply is None:
+            supply, demand = self.supply, self.demand
         row_penalties = []
         col_penalties = []
         
         # Row penalties
         for i in range(len(self.costs)):
-            if self.supply[i] > 0:
-                sorted_row = sorted([(self.costs[i][j], j) for j in range(len(self.costs[i])) if self.demand[j] > 0], key=lambda x: x[0])
+            if supply[i] > 0:
+                sorted_row = sorted([(self.costs[i][j], j) for j in range(len(self.costs[i])) if demand[j] > 0], key=lambda x: x[0])
                 if len(sorted_row) > 1:
                     row_penalties.append(sorted_row[1][0] - sorted_row[0][0])
                 else:
@@ -32,8 +127,8 @@ class BalancedProlemSolver:
 
         # Column penalties
         for j in range(len(self.costs[0])):
-            if self.demand[j] > 0:
-                sorted_col = sorted([(self.costs[i][j], i) for i in range(len(self.costs)) if self.supply[i] > 0], key=lambda x: x[0])
+            if demand[j] > 0:
+                sorted_col = sorted([(self.costs[i][j], i) for i in range(len(self.costs)) if supply[i] > 0], key=lambda x: x[0])
                 if len(sorted_col) > 1:
                     col_penalties.append(sorted_col[1][0] - sorted_col[0][0])
                 else:
@@ -43,50 +138,91 @@ class BalancedProlemSolver:
         
         return row_penalties, col_penalties
     
-    def nw_method(self):
+    def nw_method(self, compact: bool = False):
         """
         Implements the North-West Corner Method to allocate the minimum self.supply to self.demand.
+
+        - `compact` Return only the basic cells as `(row, col, quantity)` (see `north_west_corner`),
+          in O(m + n) time and memory.
         """
         if not self.balanced:
-            print("The problem is not balanced!")
-            exit(0)
+            raise NotBalancedError()
 
-        m, n = len(self.supply), len(self.demand)
+        sink = self.sink
+        if sink is not None:
+            sink.start("nw", len(self.supply), len(self.demand))
+
+        if compact:
+            solution = north_west_corner(self.supply, self.demand, sink)
+            if sink is not None:
+                sink.finish("nw")
+            return solution
+
+        supply, demand = self.supply.copy(), self.demand.copy()
+        m, n = len(supply), len(demand)
         solution = [[0] * n for _ in range(m)]  # Initialize matrix
 
         i, j = 0, 0  # Start from the top-left corner of the matrix
+        iteration = 0
 
         while i < m and j < n:
-            allocation = min(self.supply[i], self.demand[j])
+            allocation = min(supply[i], demand[j])
             solution[i][j] = allocation
+            if sink is not None:
+                sink.emit(IterationEvent("nw", iteration, i, j, None, allocation, 0.0, 0.0))
+            iteration += 1
             
             # Update the supply and demand after allocation
-            self.supply[i] -= allocation
-            self.demand[j] -= allocation
+            supply[i] -= allocation
+            demand[j] -= allocation
             
             # Move to the next row if the current supply is exhausted
-            if self.supply[i] == 0:
+            if supply[i] == 0:
                 i += 1
             # Move to the next column if the current demand is satisfied
-            if self.demand[j] == 0:
+            if demand[j] == 0:
                 j += 1
 
+        if sink is not None:
+            sink.finish("nw")
         return solution
 
-    def vogels_approximation_method(self):
+    def vogels_approximation_method(self, incremental: bool = False):
         """
         Implements the Vogel's approximation method to allocate the minimum self.supply to self.demand.
+
+        - `incremental` Keep the two cheapest live cells of every row/column and a
+          priority queue of penalties instead of re-sorting every line each iteration.
+          Produces exactly the same allocations.
         """
         if not self.balanced:
-            print("The problem is not balanced!")
-            exit(0)
+            raise NotBalancedError()
 
-        m, n = len(self.supply), len(self.demand)
+        supply, demand = self.supply.copy(), self.demand.copy()
+        m, n = len(supply), len(demand)
         solution = [[0] * n for _ in range(m)]  # Initialize solution matrix
 
-        while any(self.supply) and any(self.demand):
+        sink = self.sink
+        if sink is not None:
+            sink.start("vogel", m, n)
+
+        if incremental:
+            for i, j, allocation in indexed_vogel(supply, demand, *self.cost_index, sink=sink):
+                solution[i][j] = allocation
+            if sink is not None:
+                sink.finish("vogel")
+            return solution
+
+        iteration = 0
+        while any(supply) and any(demand):
+            if sink is not None:
+                compute_start = time.perf_counter()
+
             # Calculate penalties
-            row_penalties, col_penalties = self.calculate_penalties()
+            row_penalties, col_penalties = self.calculate_penalties(supply, demand)
+
+            if sink is not None:
+                select_start = time.perf_counter()
 
             # Find the row/column with the maximum penalty
             max_row_penalty = max(row_penalties)
@@ -96,104 +232,188 @@ class BalancedProlemSolver:
                 row_index = row_penalties.index(max_row_penalty)
                 # Select the cell with the minimum cost in this row
                 col_index = min(
-                    ((j, self.costs[row_index][j]) for j in range(n) if self.demand[j] > 0),
+                    ((j, self.costs[row_index][j]) for j in range(n) if demand[j] > 0),
                     key=lambda x: x[1], default=(None, None)
                 )[0]
             else:
                 col_index = col_penalties.index(max_col_penalty)
                 row_index = min(
-                    ((i, self.costs[i][col_index]) for i in range(m) if self.supply[i] > 0),
+                    ((i, self.costs[i][col_index]) for i in range(m) if supply[i] > 0),
                     key=lambda x: x[1], default=(None, None)
                 )[0]
 
             # Allocate as much as possible to the selected cell
-            allocation = min(self.supply[row_index], self.demand[col_index])
+            allocation = min(supply[row_index], demand[col_index])
             solution[row_index][col_index] = allocation
+            if sink is not None:
+                sink.emit(IterationEvent("vogel", iteration, row_index, col_index,
+                                         max(max_row_penalty, max_col_penalty), allocation,
+                                         select_start - compute_start, time.perf_counter() - select_start))
+            iteration += 1
 
             # Update supply and demand
-            self.supply[row_index] -= allocation
-            self.demand[col_index] -= allocation
+            supply[row_index] -= allocation
+            demand[col_index] -= allocation
 
             # If supply is exhausted, remove this row
-            if self.supply[row_index] == 0:
+            if supply[row_index] == 0:
                 row_penalties[row_index] = -1  # Ignore this row in the next iterations
 
             # If demand is satisfied, remove this column
-            if self.demand[col_index] == 0:
+            if demand[col_index] == 0:
                 col_penalties[col_index] = -1  # Ignore this column in the next iterations
 
+        if sink is not None:
+            sink.finish("vogel")
         return solution
 
-    def russells_approximation_method(self):
+    def russells_approximation_method(self, incremental: bool = False):
         """
         Implements the Russel's approximation method to allocate the minimum self.supply to self.demand.
+
+        - `incremental` Keep row/column maxima and each row's best Δ up to date as lines are
+          exhausted instead of rebuilding `Ui`, `Vj` and the whole Δ table every iteration.
+          Produces exactly the same allocations.
         """
         if not self.balanced:
-            print("The problem is not balanced!")
-            exit(0)
+            raise NotBalancedError()
 
-        m, n = len(self.supply), len(self.demand)
+        supply, demand = self.supply.copy(), self.demand.copy()
+        m, n = len(supply), len(demand)
         solution = [[0] * n for _ in range(m)]  # Initialize solution matrix
 
-        while any(self.supply) and any(self.demand):
+        sink = self.sink
+        if sink is not None:
+            sink.start("russell", m, n)
+
+        if incremental:
+            for i, j, allocation in indexed_russell(supply, demand, *self.cost_index, sink=sink):
+                solution[i][j] += allocation
+            if sink is not None:
+                sink.finish("russell")
+            return solution
+
+        iteration = 0
+        while any(supply) and any(demand):
+            if sink is not None:
+                compute_start = time.perf_counter()
+
             # Step 1: Calculate MAX for each row
-            Ui = [max(self.costs[i][j] for j in range(n) if self.demand[j] > 0) if self.supply[i] > 0 else float('-inf') for i in range(m)]
+            Ui = [max(self.costs[i][j] for j in range(n) if demand[j] > 0) if supply[i] > 0 else float('-inf') for i in range(m)]
 
             # Step 2: Calculate MAX for each column
-            Vj = [max(self.costs[i][j] for i in range(m) if self.supply[i] > 0) if self.demand[j] > 0 else float('-inf') for j in range(n)]
+            Vj = [max(self.costs[i][j] for i in range(m) if supply[i] > 0) if demand[j] > 0 else float('-inf') for j in range(n)]
 
             # Step 3: Compute deltas (current - (Max_row + Max_col))
             delta = [[self.costs[i][j] - (Ui[i] + Vj[j]) for j in range(n)] for i in range(m)]
 
+            if sink is not None:
+                select_start = time.perf_counter()
+
             # Step 4: Find the most negative Δij
             min_delta = float('inf')
             min_i, min_j = -1, -1
             for i in range(m):
                 for j in range(n):
-                    if self.demand[j] > 0 and self.supply[i] > 0 and delta[i][j] < min_delta:
+                    if demand[j] > 0 and supply[i] > 0 and delta[i][j] < min_delta:
                         min_delta = delta[i][j]
                         min_i, min_j = i, j
 
             # Step 5: Allocate as much as possible
             if min_i != -1 and min_j != -1:
-                allocation_amount = min(self.supply[min_i], self.demand[min_j])
+                allocation_amount = min(supply[min_i], demand[min_j])
                 solution[min_i][min_j] += allocation_amount
-                self.supply[min_i] -= allocation_amount
-                self.demand[min_j] -= allocation_amount
-
-                if self.supply[min_i] == 0:
+                if sink is not None:
+                    sink.emit(IterationEvent("russell", iteration, min_i, min_j, min_delta, allocation_amount,
+                                             select_start - compute_start, time.perf_counter() - select_start))
+                iteration += 1
+                supply[min_i] -= allocation_amount
+                demand[min_j] -= allocation_amount
+
+                if supply[min_i] == 0:
                     for j in range(n):
                         delta[min_i][j] = float('inf')  # Mark row as eliminated
-                if self.demand[min_j] == 0:
+                if demand[min_j] == 0:
                     for i in range(m):
                         delta[i][min_j] = float('inf')  # Mark column as eliminated
 
+        if sink is not None:
+            sink.finish("russell")
         return solution
-    
+
+    def least_cost_method(self, incremental: bool = False):
+        """
+        Implements the Least Cost method: allocates as much as possible to the cheapest cell
+        whose row and column are both still open (the first in row-major order on ties).
+
+        - `incremental` Merge the pre-sorted rows of `cost_index` with a heap and skip
+          exhausted columns lazily instead of scanning every open cell each iteration
+          (see `indexed_least_cost`). Produces exactly the same allocations.
+        """
+        if not self.balanced:
+            raise NotBalancedError()
+
+        supply, demand = self.supply.copy(), self.demand.copy()
+        m, n = len(supply), len(demand)
+        solution = [[0] * n for _ in range(m)]
+
+        sink = self.sink
+        if sink is not None:
+            sink.start("least_cost", m, n)
+
+        if incremental:
+            for i, j, allocation in indexed_least_cost(supply, demand, *self.cost_index, sink=sink):
+                solution[i][j] = allocation
+            if sink is not None:
+                sink.finish("least_cost")
+            return solution
+
+        iteration = 0
+        while any(supply) and any(demand):
+            if sink is not None:
+                select_start = time.perf_counter()
+
+            # Find the cheapest open cell
+            cost, row_index, col_index = min((self.costs[i][j], i, j) for i in range(m) if supply[i] > 0
+                                             for j in range(n) if demand[j] > 0)
+
+            # Allocate as much as possible to the selected cell
+            allocation = min(supply[row_index], demand[col_index])
+            solution[row_index][col_index] = allocation
+            if sink is not None:
+                sink.emit(IterationEvent("least_cost", iteration, row_index, col_index, cost, allocation,
+                                         0.0, time.perf_counter() - select_start))
+            iteration += 1
+
+            supply[row_index] -= allocation
+            demand[col_index] -= allocation
+
+        if sink is not None:
+            sink.finish("least_cost")
+        return solution
+
+    def solve(self, method: str) -> SolveResult:
+        """Runs a method from `METHODS` and returns its `SolveResult`; nothing is printed."""
+        start = time.perf_counter()
+        solution = METHODS[method](self)
+        elapsed = time.perf_counter() - start
+        return SolveResult(method, solution, self.costs, elapsed, self.dummy_flow(solution))
+
+    @staticmethod
+    def from_lanes(supply: list[int], demand: list[int], lanes):
+        """
+        Builds a solver for a problem given as `(source, destination, cost)` lanes, where
+        missing lanes are forbidden. See `sparse.SparseProblemSolver`.
+        """
+        from sparse import SparseProblemSolver
+        return SparseProblemSolver(supply, demand, lanes)
+
     # Function to print the input parameter table (Cost Matrix C, supply S, demand D)
-    def print_input_table(self):
-        m, n = len(self.supply), len(self.demand)
-        print("\nInput Parameter Table:\n------------------------------------------------------")
-        # Print the header for the cost matrix
-        print("dem\\sup", end=" | ")
-        for j in range(n):
-            print(f"Dest {j + 1}", end=" | ")
-        print("supply")
-        print("------------------------------------------------------")
-
-        # Print the cost matrix and supply values
-        for i in range(m):
-            print(f"  Src {(i + 1):<3}", end=" | ")
-            for j in range(n):
-                print(f"{self.costs[i][j]:<6}", end=" | ")
-            print(f"{self.supply[i]}")
- 
-        # Print the demand values
-        print("------------------------------------------------------")
-        print(f"  Demand:", end=" | ")
-        for j in range(len(self.demand)):
-            print(f" {self.demand[j]:<5}", end=" | ")
-        print("\n------------------------------------------------------")
+    def print_input_table(self, report=None):
+        target = report or Report()
+        target.input_table(self.costs, self.supply, self.demand)
+        if report is None:
+            target.flush()
 
     """
         Three functions to check if problem is:
@@ -225,12 +445,522 @@ class BalancedProlemSolver:
         return False
     
 
+# Cost matrix with an implicit dummy row or column
+class DummyLineCosts:
+    """
+    Read-only view of an m x n cost matrix extended by a dummy row (`dummy_row`) or a dummy
+    column, every dummy lane costing `dummy_cost`. Nothing of the original matrix is copied:
+    a dummy row is a constant row object and, for a dummy column, each row is wrapped in a
+    small view that answers the extra index itself.
+    """
+    def __init__(self, costs, m: int, n: int, dummy_row: bool, dummy_cost):
+        self.base = costs
+        self.m, self.n = m, n
+        self.dummy_row = dummy_row
+        self.dummy_cost = dummy_cost
+        if dummy_row:
+            self._dummy = _ConstantRow(n, dummy_cost)
+            self._rows = None
+        else:
+            self._rows = [None] * m  # row views, created on first access
+
+    def __len__(self):
+        return self.m + 1 if self.dummy_row else self.m
+
+    def __getitem__(self, i):
+        if self.dummy_row:
+            if i < 0:
+                i += self.m + 1
+            return self._dummy if i == self.m else self.base[i]
+        row = self._rows[i]
+        if row is None:
+            row = self._rows[i] = _PaddedRow(self.base[i], self.dummy_cost)
+        return row
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class _ConstantRow:
+    def __init__(self, n: int, value):
+        self.n, self.value = n, value
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, j):
+        if not -self.n <= j < self.n:
+            raise IndexError(j)
+        return self.value
+
+    def __iter__(self):
+        return itertools.repeat(self.value, self.n)
+
+
+class _PaddedRow:
+    def __init__(self, row, value):
+        self.row, self.value, self.n = row, value, len(row)
+
+    def __len__(self):
+        return self.n + 1
+
+    def __getitem__(self, j):
+        if j < 0:
+            j += self.n + 1
+        if j == self.n:
+            return self.value
+        return self.row[j]
+
+    def __iter__(self):
+        yield from self.row
+        yield self.value
+
+
+# North-West corner on quantities only
+def north_west_corner(supply, demand, sink=None):
+    """
+    North-West corner in O(m + n) time and memory.
+
+    Returns the basic cells as a list of `(row, col, quantity)`; `supply` and `demand`
+    are not modified. `sink` receives an `IterationEvent` per step.
+    """
+    m, n = len(supply), len(demand)
+    solution = []
+    i, j = 0, 0
+    supply_left, demand_left = supply[0] if m else 0, demand[0] if n else 0
+
+    while i < m and j < n:
+        allocation = min(supply_left, demand_left)
+        solution.append((i, j, allocation))
+        if sink is not None:
+            sink.emit(IterationEvent("nw", len(solution) - 1, i, j, None, allocation, 0.0, 0.0))
+        supply_left -= allocation
+        demand_left -= allocation
+
+        # Same moves as nw_method, including both at once when the two are exhausted
+        if supply_left == 0:
+            i += 1
+            if i < m:
+                supply_left = supply[i]
+        if demand_left == 0:
+            j += 1
+            if j < n:
+                demand_left = demand[j]
+
+    return solution
+
+
+# Sorted cost orders of every row and column, shared by the incremental methods
+def line_orders(costs, deadline: float = None, partial=None):
+    """
+    Sorts every row and column of `costs` once.
+
+    Returns `row_order`, `row_cost`, `col_order`, `col_cost`: for row `i`, `row_order[i]`
+    holds the column indices sorted by (cost, index) and `row_cost[i]` the matching costs
+    (same for columns). Ties keep the lower index first, like `min()` and `index()` do.
+    Raises `TimeoutError` once `deadline` (a `time.perf_counter()` value) is passed.
+
+    - `partial` The four lists to fill, possibly left partly filled by a call that timed
+      out: the sort resumes at the first missing line.
+    """
+    m, n = len(costs), len(costs[0])
+    row_order, row_cost, col_order, col_cost = partial or ([], [], [], [])
+    for i in range(len(row_order), m):
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeoutError()
+        row = costs[i]
+        order = sorted(range(n), key=row.__getitem__)
+        row_order.append(order)
+        row_cost.append([row[j] for j in order])
+
+    for j in range(len(col_order), n):
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeoutError()
+        column = [costs[i][j] for i in range(m)]
+        order = sorted(range(m), key=column.__getitem__)
+        col_order.append(order)
+        col_cost.append([column[i] for i in order])
+
+    return row_order, row_cost, col_order, col_cost
+
+
+class CostIndex:
+    """
+    `line_orders` of one cost matrix, built once and reused by every incremental method
+    and by every supply/demand solved against the same matrix.
+
+    Unpacks like the tuple of `line_orders`: `indexed_vogel(supply, demand, *index)`.
+    The engines only read it; their cursors skip exhausted lines. `build_time` holds the
+    seconds spent sorting and `nbytes` the memory of the index: its lists, the int objects
+    of the orders and, unless the matrix rows are lists sharing them, the cost objects.
+    `deadline` and `partial` are passed to `line_orders`.
+    """
+    def __init__(self, costs, deadline: float = None, partial=None):
+        start = time.perf_counter()
+        self.row_order, self.row_cost, self.col_order, self.col_cost = line_orders(costs, deadline, partial)
+        self.build_time = time.perf_counter() - start
+        self.shape = (len(self.row_order), len(self.col_order))
+        self._shares_costs = all(isinstance(row, list) for row in costs)
+
+    def __iter__(self):
+        return iter((self.row_order, self.row_cost, self.col_order, self.col_cost))
+
+    @property
+    def nbytes(self) -> int:
+        lines = [self.row_order, self.col_order]
+        if not self._shares_costs:
+            lines += [self.row_cost, self.col_cost]
+        # Every sorted line holds its own objects, except the small ints Python caches;
+        # the allocator rounds each one up to 16 bytes
+        objects = sum(-(-sys.getsizeof(value) // 16) * 16 for line in itertools.chain(*lines) for value in line
+                      if not (type(value) is int and -5 <= value <= 256))
+        return objects + sum(sys.getsizeof(lines) + sum(map(sys.getsizeof, lines)) for lines in self)
+
+
+def _next_alive(order, alive, pos):
+    # First position at or after `pos` whose line is still alive (None if there is none)
+    while pos < len(order):
+        if alive[order[pos]]:
+            return pos
+        pos += 1
+    return None
+
+
+def indexed_vogel(supply, demand, row_order, row_cost, col_order, col_cost, sink=None, deadline: float = None):
+    """
+    Incremental Vogel's approximation over pre-sorted lines (see `line_orders`).
+
+    Every line keeps cursors to its two cheapest live cells; cursors only move forward
+    since lines are never revived. When a row/column is exhausted only the lines whose
+    top-two cells referenced it are updated, and the max-penalty line is taken from a heap.
+
+    Yields `(i, j, allocation)` in the same order as `vogels_approximation_method`.
+    `supply` and `demand` are not modified. `sink` receives an `IterationEvent` per step.
+    Raises `TimeoutError` once `deadline` (a `time.perf_counter()` value) is passed.
+    """
+    if sink is not None:
+        compute_start = time.perf_counter()
+    supply, demand = list(supply), list(demand)
+    m, n = len(supply), len(demand)
+    row_alive = [s > 0 for s in supply]
+    col_alive = [d > 0 for d in demand]
+    rows_left, cols_left = sum(row_alive), sum(col_alive)
+
+    # Cursors to the first/second live cell of each line, lines watching each index
+    row_top = [[0, 0] for _ in range(m)]
+    col_top = [[0, 0] for _ in range(n)]
+    row_watch = [set() for _ in range(m)]  # columns whose top-two cells sit in row i
+    col_watch = [set() for _ in range(n)]  # rows whose top-two cells sit in column j
+    row_pen = [-1] * m
+    col_pen = [-1] * n
+    row_heap, col_heap = [], []
+
+    def refresh(k, top, order, cost, alive, watch, penalties, heap):
+        first = _next_alive(order[k], alive, top[k][0])
+        if first is None:
+            raise InfeasibleProblemError()
+        second = _next_alive(order[k], alive, max(top[k][1], first + 1))
+        top[k][0] = first
+        watch[order[k][first]].add(k)
+        if second is None:
+            top[k][1] = len(order[k])
+            penalty = float('inf')  # No second smallest cost, assign infinity
+        else:
+            top[k][1] = second
+            watch[order[k][second]].add(k)
+            penalty = cost[k][second] - cost[k][first]
+        if penalty != penalties[k]:
+            penalties[k] = penalty
+            heapq.heappush(heap, (-penalty, k))
+
+    def best(heap, alive, penalties):
+        # Largest penalty, lowest index on ties; drops stale heap entries
+        while heap:
+            penalty, k = heap[0]
+            if alive[k] and penalties[k] == -penalty:
+                return k
+            heapq.heappop(heap)
+        return None
+
+    for i in range(m):
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeoutError()
+        if row_alive[i]:
+            refresh(i, row_top, row_order, row_cost, col_alive, col_watch, row_pen, row_heap)
+    for j in range(n):
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeoutError()
+        if col_alive[j]:
+            refresh(j, col_top, col_order, col_cost, row_alive, row_watch, col_pen, col_heap)
+
+    iteration = 0
+    while rows_left and cols_left:
+        if sink is not None:
+            select_start = time.perf_counter()
+            compute_time = select_start - compute_start
+        row_index = best(row_heap, row_alive, row_pen)
+        col_index = best(col_heap, col_alive, col_pen)
+
+        penalty = max(row_pen[row_index], col_pen[col_index])
+        if row_pen[row_index] >= col_pen[col_index]:
+            col_index = row_order[row_index][row_top[row_index][0]]
+        else:
+            row_index = col_order[col_index][col_top[col_index][0]]
+
+        allocation = min(supply[row_index], demand[col_index])
+        supply[row_index] -= allocation
+        demand[col_index] -= allocation
+        if sink is not None:
+            compute_start = time.perf_counter()
+            sink.emit(IterationEvent("vogel", iteration, row_index, col_index, penalty, allocation,
+                                     compute_time, compute_start - select_start))
+        iteration += 1
+        yield row_index, col_index, allocation
+
+        # Mark exhausted lines first, then refresh the lines that referenced them
+        row_done = supply[row_index] == 0
+        col_done = demand[col_index] == 0
+        if row_done:
+            row_alive[row_index] = False
+            rows_left -= 1
+        if col_done:
+            col_alive[col_index] = False
+            cols_left -= 1
+        if row_done:
+            for j in row_watch[row_index]:
+                if deadline is not None and time.perf_counter() > deadline:
+                    raise TimeoutError()
+                if col_alive[j]:
+                    refresh(j, col_top, col_order, col_cost, row_alive, row_watch, col_pen, col_heap)
+            row_watch[row_index].clear()
+        if col_done:
+            for i in col_watch[col_index]:
+                if deadline is not None and time.perf_counter() > deadline:
+                    raise TimeoutError()
+                if row_alive[i]:
+                    refresh(i, row_top, row_order, row_cost, col_alive, col_watch, row_pen, row_heap)
+            col_watch[col_index].clear()
+
+
+def _prev_alive(order, alive, pos):
+    # Last position at or before `pos` whose line is still alive (None if there is none)
+    while pos >= 0:
+        if alive[order[pos]]:
+            return pos
+        pos -= 1
+    return None
+
+
+def indexed_russell(supply, demand, row_order, row_cost, col_order, col_cost, sink=None, deadline: float = None):
+    """
+    Incremental Russell's approximation over pre-sorted lines (see `line_orders`).
+
+    `Ui`/`Vj` are read from cursors to the most expensive live cell of each line, and each
+    row remembers its cell with the smallest `c_ij - Vj`. Maxima can only decrease, so a row
+    only has to be rescanned when its best column is exhausted or that column's `Vj` drops;
+    a change of `Ui` shifts the whole row and keeps its best cell. Rows are kept in a heap
+    by their best Δ, which gives the most negative Δ with the same row-major tie-breaking.
+
+    Yields `(i, j, allocation)` in the same order as `russells_approximation_method`.
+    `supply` and `demand` are not modified. `sink` receives an `IterationEvent` per step.
+    Raises `TimeoutError` once `deadline` (a `time.perf_counter()` value) is passed.
+    """
+    if sink is not None:
+        compute_start = time.perf_counter()
+    supply, demand = list(supply), list(demand)
+    m, n = len(supply), len(demand)
+    row_alive = [s > 0 for s in supply]
+    col_alive = [d > 0 for d in demand]
+    rows_left, cols_left = sum(row_alive), sum(col_alive)
+
+    # Step 1 & 2: cursors to the MAX of every row/column and the lines that depend on them
+    row_hi = [len(order) - 1 for order in row_order]
+    col_hi = [len(order) - 1 for order in col_order]
+    U = [float('-inf')] * m
+    V = [float('-inf')] * n
+    row_hi_watch = [set() for _ in range(m)]  # columns whose max sits in row i
+    col_hi_watch = [set() for _ in range(n)]  # rows whose max sits in column j
+
+    def update_row_max(i):
+        pos = _prev_alive(row_order[i], col_alive, row_hi[i])
+        if pos is None:
+            raise InfeasibleProblemError()
+        row_hi[i] = pos
+        U[i] = row_cost[i][pos]
+        col_hi_watch[row_order[i][pos]].add(i)
+
+    def update_col_max(j):
+        pos = _prev_alive(col_order[j], row_alive, col_hi[j])
+        if pos is None:
+            raise InfeasibleProblemError()
+        col_hi[j] = pos
+        V[j] = col_cost[j][pos]
+        row_hi_watch[col_order[j][pos]].add(j)
+
+    # Step 3: every row's cell with the smallest Δ (lowest column index on ties)
+    row_best = [None] * m
+    best_watch = [set() for _ in range(n)]  # rows whose best cell sits in column j
+    stamp = [0] * m
+    heap = []
+
+    def update_row_best(i):
+        order, cost = row_order[i], row_cost[i]
+        best_pos, best_key = None, None
+        for pos, j in enumerate(order):
+            if col_alive[j]:
+                key = (cost[pos] - V[j], j)
+                if best_key is None or key < best_key:
+                    best_pos, best_key = pos, key
+        row_best[i] = best_pos
+        if best_pos is not None:
+            best_watch[order[best_pos]].add(i)
+
+    def push(i):
+        pos = row_best[i]
+        j = row_order[i][pos]
+        stamp[i] += 1
+        heapq.heappush(heap, (row_cost[i][pos] - (U[i] + V[j]), i, stamp[i]))
+
+    for i in range(m):
+        if row_alive[i]:
+            update_row_max(i)
+    for j in range(n):
+        if col_alive[j]:
+            update_col_max(j)
+    for i in range(m):
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeoutError()
+        if row_alive[i]:
+            update_row_best(i)
+            push(i)
+
+    iteration = 0
+    while rows_left and cols_left:
+        if sink is not None:
+            select_start = time.perf_counter()
+            compute_time = select_start - compute_start
+
+        # Step 4: Find the most negative Δij
+        while True:
+            min_delta, min_i, version = heap[0]
+            if row_alive[min_i] and stamp[min_i] == version:
+                break
+            heapq.heappop(heap)
+        min_j = row_order[min_i][row_best[min_i]]
+
+        # Step 5: Allocate as much as possible
+        allocation = min(supply[min_i], demand[min_j])
+        supply[min_i] -= allocation
+        demand[min_j] -= allocation
+        if sink is not None:
+            compute_start = time.perf_counter()
+            sink.emit(IterationEvent("russell", iteration, min_i, min_j, min_delta, allocation,
+                                     compute_time, compute_start - select_start))
+        iteration += 1
+        yield min_i, min_j, allocation
+
+        row_done = supply[min_i] == 0
+        col_done = demand[min_j] == 0
+        if row_done:
+            row_alive[min_i] = False
+            rows_left -= 1
+        if col_done:
+            col_alive[min_j] = False
+            cols_left -= 1
+
+        shifted, rescan = set(), set()
+        if row_done:
+            # Columns whose max was in this row get a smaller Vj
+            for j in row_hi_watch[min_i]:
+                if col_alive[j]:
+                    update_col_max(j)
+                    rescan.update(i for i in best_watch[j] if row_alive[i])
+            row_hi_watch[min_i].clear()
+        if col_done:
+            # Rows whose max was in this column get a smaller Ui
+            for i in col_hi_watch[min_j]:
+                if row_alive[i]:
+                    update_row_max(i)
+                    shifted.add(i)
+            col_hi_watch[min_j].clear()
+            rescan.update(i for i in best_watch[min_j] if row_alive[i])
+            best_watch[min_j].clear()
+
+        for i in rescan:
+            if deadline is not None and time.perf_counter() > deadline:
+                raise TimeoutError()
+            best_watch[row_order[i][row_best[i]]].discard(i)
+            update_row_best(i)
+        for i in shifted | rescan:
+            push(i)
+
+
+def indexed_least_cost(supply, demand, row_order, row_cost, col_order, col_cost, sink=None, deadline: float = None):
+    """
+    Incremental Least Cost method over pre-sorted rows (see `line_orders`).
+
+    The sorted rows are merged lazily into one global (cost, row, column) order with a
+    heap holding each open row's cheapest open cell. Exhausted rows are never pushed
+    again and exhausted columns are skipped when they reach the top of the heap, so
+    every cell is looked at most once: O(mn + (m + n) log m) after sorting.
+
+    Yields `(i, j, allocation)` in the same order as `least_cost_method`.
+    `supply` and `demand` are not modified. `sink` receives an `IterationEvent` per step.
+    Raises `TimeoutError` once `deadline` (a `time.perf_counter()` value) is passed.
+    """
+    supply, demand = list(supply), list(demand)
+    col_alive = [d > 0 for d in demand]
+    rows_left, cols_left = sum(s > 0 for s in supply), sum(col_alive)
+
+    # Cheapest open cell of every open row: (cost, row, column, position in the row order)
+    heap = []
+    if cols_left:
+        for i, order in enumerate(row_order):
+            if supply[i] > 0:
+                pos = _next_alive(order, col_alive, 0)
+                heap.append((row_cost[i][pos], i, order[pos], pos))
+        heapq.heapify(heap)
+
+    iteration = 0
+    while rows_left and cols_left:
+        if sink is not None:
+            select_start = time.perf_counter()
+        cost, i, j, pos = heap[0]
+        if not col_alive[j]:
+            # Lazy deletion: move the row to its next open column
+            if deadline is not None and time.perf_counter() > deadline:
+                raise TimeoutError()
+            pos = _next_alive(row_order[i], col_alive, pos + 1)
+            if pos is None:
+                raise InfeasibleProblemError()
+            heapq.heapreplace(heap, (row_cost[i][pos], i, row_order[i][pos], pos))
+            continue
+
+        allocation = min(supply[i], demand[j])
+        supply[i] -= allocation
+        demand[j] -= allocation
+        if sink is not None:
+            sink.emit(IterationEvent("least_cost", iteration, i, j, cost, allocation,
+                                     0.0, time.perf_counter() - select_start))
+        iteration += 1
+        yield i, j, allocation
+
+        if demand[j] == 0:
+            col_alive[j] = False
+            cols_left -= 1
+        if supply[i] == 0:
+            rows_left -= 1
+            heapq.heappop(heap)
+
+
 # Function to print the solution matrix
-def print_solution(solution):
-    print("\nSolution Matrix:")
-    for row in solution:
-        print(row)
-    
+def print_solution(solution, report=None):
+    target = report or Report()
+    target.solution(solution)
+    if report is None:
+        target.flush()
+
 
 # Function to handle input and processing
 def get_input():
@@ -247,32 +977,176 @@ def get_input():
     return supply, demand, cost_matrix
 
 
-# Function to calculate and print the total cost with equation form
-def calculate_total_cost(init_matrix, solution_matrix):
-    total_cost = 0
-    equation_parts = []
+# Function to calculate the total cost without printing anything
+def solution_cost(costs, solution_matrix):
+    return sum(c * q for cost_row, row in zip(costs, solution_matrix) for c, q in zip(cost_row, row) if q)
 
-    # Calculate the total cost and construct the equation parts
-    for i in range(len(init_matrix)):
-        for j in range(len(solution_matrix[0])):
-            if solution_matrix[i][j] != 0:
-                coeff = init_matrix[i][j]
-                allocation = solution_matrix[i][j]
-                total_cost += coeff * allocation
-                equation_parts.append(f"{coeff} * {allocation}")
 
-    # Print the equation form
-    equation = " + ".join(equation_parts)
-    print(f"\nTotal cost: {equation} = {total_cost}\n\n")
-    return total_cost
+# Methods by name, used by the library entry points (batch, benchmarks)
+METHODS = {
+    "nw": lambda solver: solver.nw_method(),
+    "vogel": lambda solver: solver.vogels_approximation_method(incremental=True),
+    "russell": lambda solver: solver.russells_approximation_method(incremental=True),
+    "least_cost": lambda solver: solver.least_cost_method(incremental=True),
+}
+
+
+# Function to calculate and print the total cost with equation form
+def calculate_total_cost(init_matrix, solution_matrix, report=None):
+    result = SolveResult(None, solution_matrix, init_matrix, 0.0)
+    target = report or Report()
+    target.total_cost(result)
+    if report is None:
+        target.flush()
+    return result.total_cost
+
+
+# Non-interactive mode: read the problem from a file or stdin and print the costs
+def solve_from_file(args):
+    from problem_io import guess_format, load_problem
+
+    if args.block_rows is not None:
+        if (args.format or guess_format(args.input)) != "binary":
+            print("Out-of-core solving (--block-rows) needs a binary problem file")
+            return
+        solve_out_of_core_file(args)
+        return
+
+    try:
+        supply, demand, cost_matrix = load_problem(args.input, args.format)
+    except ValueError as error:
+        print(f"Invalid input: {error}")
+        return
+    verbosity = FULL if args.print_solution else args.verbosity
+    report = Report(verbosity=verbosity, max_rows=args.max_rows, max_cols=args.max_cols)
+    report.line(f"Problem: {len(supply)} sources x {len(demand)} destinations")
+
+    validation = validate_problem(supply, demand, cost_matrix)
+    if not validation.applicable or not (validation.balanced or args.balance):
+        report.flush()
+        for reason in validation.errors():
+            print(f"  - {reason}")
+        print(NotBalancedError() if validation.applicable else NotApplicableError())
+        return
+    sink = HistogramSink() if args.profile else None
+    solver = BalancedProlemSolver(supply, demand, cost_matrix, validate=False,
+                                  auto_balance=args.balance, dummy_cost=args.dummy_cost, sink=sink)
+    if solver.dummy:
+        report.line(f"Balanced with a dummy {solver.dummy} (cost {args.dummy_cost})")
+    if args.portfolio:
+        solve_portfolio(solver, args, report)
+        return
+    if args.anytime:
+        solve_anytime(solver, args, report)
+        return
+    cache = ResultCache(directory=args.cache) if args.cache else None
+    key = fingerprint(solver.supply, solver.demand, solver.costs) if cache is not None else None
+    for method in args.methods:
+        report.result(solver.solve(method) if cache is None else cache.solve(solver, method, key))
+    if cache is not None:
+        report.line(f"Cache: {cache.hits + cache.disk_hits} hits, {cache.misses} misses ({args.cache})")
+    if sink is not None:
+        sink.export(args.profile)
+        report.line(f"Per-iteration histograms written to {args.profile}")
+    report.flush()
+
+
+# Out-of-core mode: read the costs of a binary file block by block
+def solve_out_of_core_file(args):
+    from outofcore import solve_out_of_core
+
+    report = Report(verbosity=FULL if args.print_solution else args.verbosity,
+                    max_rows=args.max_rows, max_cols=args.max_cols)
+    for method in args.methods:
+        try:
+            result = solve_out_of_core(args.input, method, args.block_rows)
+        except (TransportationProblemError, EOFError) as error:
+            print(error)
+            return
+        report.result(result)
+        report.line(f"   read {result.bytes_read:,} bytes in {result.blocks_read} blocks")
+    report.flush()
+
+
+# Anytime mode: improve the plan until the budget runs out
+def solve_anytime(solver, args, report):
+    from anytime import ENGINES, anytime_solve
+
+    methods = [method for method in args.methods if method in ENGINES]
+    budget = 0.2 if args.budget is None else args.budget
+
+    def progress(result):
+        report.line(f"   {result.elapsed:.3f}s {result.stage}: total cost {result.total_cost} ({result.method})")
+
+    # The command line owns its process, so the collector can be paused for the solve
+    result = anytime_solve(solver, budget, methods, progress, pause_gc=True)
+    status = "deadline reached" if result.timed_out else "finished"
+    report.line(f"Stage reached: {result.stage} after {result.pivots} pivots ({status}, budget {budget}s)")
+    report.result(result)
+    report.flush()
+
+
+# Portfolio mode: run the methods concurrently and keep the cheapest plan
+def solve_portfolio(solver, args, report):
+    from portfolio import run_portfolio
+
+    outcome = run_portfolio(solver, args.methods, args.budget)
+    for method in args.methods:
+        if method in outcome.total_costs:
+            status = f"total cost {outcome.total_costs[method]}"
+        elif method in outcome.errors:
+            status = outcome.errors[method]
+        else:
+            status = "cancelled"
+        wall = f" ({outcome.wall_times[method]:.3f}s)" if method in outcome.wall_times else ""
+        report.line(f"   {method}: {status}{wall}")
+    if outcome.best is None:
+        report.line("No method finished within the budget")
+    else:
+        report.line(f"Winner: {outcome.winner}")
+        report.result(outcome.best)
+    report.flush()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Initial basic feasible solutions of a transportation problem")
+    parser.add_argument("input", nargs="?", help="problem file ('-' for stdin); asks interactively if omitted")
+    parser.add_argument("--format", choices=["text", "csv", "binary"], help="input format (default: from the file extension)")
+    parser.add_argument("--methods", nargs="+", choices=list(METHODS), default=list(METHODS))
+    parser.add_argument("--print-solution", action="store_true", help="print the solution matrices (same as --verbosity 2)")
+    parser.add_argument("--verbosity", type=int, choices=[SILENT, SUMMARY, FULL], default=SUMMARY,
+                        help="0: nothing, 1: total costs (default), 2: total costs and solution matrices")
+    parser.add_argument("--max-rows", type=int, default=20, help="rows shown per matrix before truncating")
+    parser.add_argument("--max-cols", type=int, default=12, help="columns shown per matrix before truncating")
+    parser.add_argument("--balance", action="store_true", help="balance the problem with a dummy source/destination")
+    parser.add_argument("--dummy-cost", type=int, default=0, help="cost of the dummy lanes (default: 0)")
+    parser.add_argument("--block-rows", type=int, help="solve a binary file out of core, reading BLOCK_ROWS cost rows at a time")
+    parser.add_argument("--portfolio", action="store_true", help="run the methods concurrently, keep the cheapest plan")
+    parser.add_argument("--anytime", action="store_true",
+                        help="start from North-West, improve with the methods then MODI pivots until --budget runs out")
+    parser.add_argument("--budget", type=float, help="with --portfolio, stop the methods still running after BUDGET seconds; "
+                                                     "with --anytime, the time budget (default: 0.2)")
+    parser.add_argument("--cache", metavar="DIR", help="reuse results of identical problems stored in DIR")
+    parser.add_argument("--profile", metavar="JSON", help="write per-iteration histograms of every method to JSON")
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+    if args.input is not None:
+        solve_from_file(args)
+        return
+
     # Receive inp.
     supply, demand, cost_matrix = get_input()
 
-    solver = BalancedProlemSolver(supply.copy(), demand.copy(), cost_matrix)
-    solver.print_input_table()
+    try:
+        solver = BalancedProlemSolver(supply, demand, cost_matrix)
+    except TransportationProblemError as error:
+        print(error)
+        return
+    report = Report()
+    solver.print_input_table(report)
 
     '''
     # FIRST INPUT:
@@ -310,10 +1184,10 @@ def main():
     ------------------------------------------------------
     '''
 
-    print("-- Solution with NW method --")
+    report.line("-- Solution with NW method --")
     solution_matrix = solver.nw_method()
-    print_solution(solution_matrix)
-    total_cost = calculate_total_cost(cost_matrix, solution_matrix)
+    print_solution(solution_matrix, report)
+    total_cost = calculate_total_cost(cost_matrix, solution_matrix, report)
 
     '''
     # FIRST INPUT:
@@ -339,11 +1213,11 @@ def main():
     Total cost: 6 * 7 + 3 * 12 + 5 * 3 + 2 * 14 + 7 * 1 + 6 * 8 = 176
     '''
     
-    print("-- Solution with Vogel's approx. --")
-    solver = BalancedProlemSolver(supply.copy(), demand.copy(), cost_matrix)
+    report.line("-- Solution with Vogel's approx. --")
     solution_matrix = solver.vogels_approximation_method()
-    print_solution(solution_matrix)
-    total_cost = calculate_total_cost(cost_matrix, solution_matrix)
+    vogel_solution = solution_matrix
+    print_solution(solution_matrix, report)
+    total_cost = calculate_total_cost(cost_matrix, solution_matrix, report)
     
     '''
     # FIRST INPUT:
@@ -369,11 +1243,10 @@ def main():
     Total cost: 3 * 12 + 5 * 2 + 4 * 8 + 2 * 15 + 5 * 7 + 6 * 1 = 149
     '''
     
-    print("-- Solution with Russel's approx. --")
-    solver = BalancedProlemSolver(supply.copy(), demand.copy(), cost_matrix)
+    report.line("-- Solution with Russel's approx. --")
     solution_matrix = solver.russells_approximation_method()
-    print_solution(solution_matrix)
-    total_cost = calculate_total_cost(cost_matrix, solution_matrix)
+    print_solution(solution_matrix, report)
+    total_cost = calculate_total_cost(cost_matrix, solution_matrix, report)
 
     '''
     # FIRST INPUT:
@@ -399,6 +1272,55 @@ def main():
     Total cost: 3 * 12 + 5 * 2 + 4 * 8 + 2 * 15 + 5 * 7 + 6 * 1 = 149
     '''
 
+    report.line("-- Solution with Least Cost method --")
+    solution_matrix = solver.least_cost_method()
+    print_solution(solution_matrix, report)
+    total_cost = calculate_total_cost(cost_matrix, solution_matrix, report)
+
+    '''
+    # FIRST INPUT:
+
+    -- Solution with Least Cost method --
+
+    Solution Matrix:
+    [0, 0, 0, 7]
+    [2, 0, 7, 0]
+    [3, 8, 0, 7]
+
+    Total cost: 10 * 7 + 70 * 2 + 40 * 7 + 40 * 3 + 8 * 8 + 20 * 7 = 814
+
+    # FOURTH INPUT:
+
+    -- Solution with Least Cost method --
+
+    Solution Matrix:
+    [0, 12, 1, 9]
+    [0, 0, 15, 0]
+    [7, 0, 1, 0]
+
+    Total cost: 3 * 12 + 5 * 1 + 4 * 9 + 2 * 15 + 5 * 7 + 8 * 1 = 150
+    '''
+
+    report.line("-- Optimal solution (MODI from Vogel's) --")
+    result = modi_method(cost_matrix, vogel_solution)
+    print_solution(result.solution, report)
+    total_cost = calculate_total_cost(cost_matrix, result.solution, report)
+    report.line(f"MODI pivots: {result.iterations} ({result.elapsed:.6f}s)\n")
+    report.flush()
+
+    '''
+    # FIRST INPUT:
+
+    -- Optimal solution (MODI from Vogel's) --
+
+    Solution Matrix:
+    [5, 0, 0, 2]
+    [0, 2, 7, 0]
+    [0, 6, 0, 12]
+
+    Total cost: 19 * 5 + 10 * 2 + 30 * 2 + 40 * 7 + 8 * 6 + 20 * 12 = 743
+    '''
+
 
 if __name__ == "__main__":
     main()
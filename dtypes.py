@@ -0,0 +1,63 @@
+"""
+Compact storage of costs and quantities.
+
+Costs are stored in the narrowest `array` typecode that holds their range ('h' = int16,
+'i' = int32, 'q' = int64, 'd' = float64); integers beyond int64 stay Python ints in
+plain lists. Values read from an array are Python ints/floats, so totals, penalties and
+Russell's Δ are computed without any fixed-width overflow.
+
+Fractional quantities are kept as exact `Fraction`s, so balance checks and the
+subtractions of the methods stay exact (0.1 + 0.2 supplies balance a 0.3 demand).
+"""
+from array import array
+from fractions import Fraction
+
+INTEGER_TYPECODES = ('h', 'i', 'q')
+
+
+def integer_typecode(minimum: int, maximum: int):
+    """Narrowest integer typecode holding [minimum, maximum], None beyond int64."""
+    for typecode in INTEGER_TYPECODES:
+        bits = 8 * array(typecode).itemsize
+        if -(1 << (bits - 1)) <= minimum and maximum < (1 << (bits - 1)):
+            return typecode
+    return None
+
+
+def cost_typecode(rows):
+    """Typecode for a whole cost matrix: 'h', 'i', 'q', 'd', or None (keep Python ints)."""
+    minimum = maximum = None
+    integral = True
+    for row in rows:
+        if not len(row):
+            continue
+        if integral and not (isinstance(row, array) and row.typecode in 'bBhHiIlLqQ'):
+            integral = all(isinstance(value, int) for value in row)
+        row_min, row_max = min(row), max(row)
+        minimum = row_min if minimum is None else min(minimum, row_min)
+        maximum = row_max if maximum is None else max(maximum, row_max)
+    if minimum is None:
+        return 'h'
+    return integer_typecode(minimum, maximum) if integral else 'd'
+
+
+def compact_costs(rows, typecode: str = None):
+    """
+    Cost rows as `array`s of `typecode` (chosen by `cost_typecode` if omitted).
+    Rows already in that typecode are kept; integers beyond int64 stay lists.
+    """
+    typecode = typecode or cost_typecode(rows)
+    if typecode is None:
+        return [row if isinstance(row, list) else list(row) for row in rows]
+    return [row if isinstance(row, array) and row.typecode == typecode else array(typecode, row) for row in rows]
+
+
+def exact_quantity(value):
+    """Integral values as `int`, fractional ones as the `Fraction` of their decimal form."""
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else Fraction(repr(value))
+    return value
+
+
+def exact_quantities(values) -> list:
+    return [exact_quantity(value) for value in values]
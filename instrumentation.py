@@ -0,0 +1,133 @@
+import json
+import math
+
+
+class IterationEvent:
+    """
+    One allocation step of a method.
+
+    - `method` "nw", "vogel", "russell" or "least_cost".
+    - `iteration` 0-based step number.
+    - `row`, `col` Selected cell.
+    - `score` Penalty of the selected line (Vogel's), Δ of the selected cell (Russell's),
+      cost of the selected cell (Least Cost), None for North-West.
+    - `allocation` Quantity allocated to the cell.
+    - `compute_time` Seconds spent computing penalties/Δ in this step.
+    - `select_time` Seconds spent selecting the line and the cell.
+    """
+    __slots__ = ("method", "iteration", "row", "col", "score", "allocation", "compute_time", "select_time")
+
+    def __init__(self, method, iteration, row, col, score, allocation, compute_time, select_time):
+        self.method = method
+        self.iteration = iteration
+        self.row = row
+        self.col = col
+        self.score = score
+        self.allocation = allocation
+        self.compute_time = compute_time
+        self.select_time = select_time
+
+
+class Sink:
+    """
+    Receives the events of an instrumented solver (`BalancedProlemSolver(sink=...)`).
+    Solvers without a sink never build events or read the clock.
+    """
+    def start(self, method: str, m: int, n: int):
+        pass
+
+    def emit(self, event: IterationEvent):
+        pass
+
+    def finish(self, method: str):
+        pass
+
+
+class ListSink(Sink):
+    """Keeps every event, for tests and small problems."""
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event: IterationEvent):
+        self.events.append(event)
+
+
+class Histogram:
+    """Counts values in power-of-two buckets (bucket k holds values in [2^k, 2^(k+1)))."""
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale  # e.g. 1e6 to bucket seconds as microseconds
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value):
+        if value is None or value != value or value in (math.inf, -math.inf):
+            return
+        value *= self.scale
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        magnitude = abs(value)
+        key = "0" if magnitude < 1 else str(2 ** int(math.log2(magnitude)))
+        if value < 0:
+            key = "-" + key
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.total / self.count if self.count else None,
+            "buckets": self.buckets,
+        }
+
+
+class HistogramSink(Sink):
+    """
+    Aggregates events per method into histograms of compute/select time (microseconds),
+    score and allocation; `to_json()`/`export()` produce the dashboard payload.
+    """
+    def __init__(self):
+        self.methods = {}
+
+    def _stats(self, method):
+        stats = self.methods.get(method)
+        if stats is None:
+            stats = self.methods[method] = {
+                "runs": 0,
+                "iterations": 0,
+                "compute_us": Histogram(1e6),
+                "select_us": Histogram(1e6),
+                "score": Histogram(),
+                "allocation": Histogram(),
+            }
+        return stats
+
+    def start(self, method: str, m: int, n: int):
+        self._stats(method)["runs"] += 1
+
+    def emit(self, event: IterationEvent):
+        stats = self._stats(event.method)
+        stats["iterations"] += 1
+        stats["compute_us"].add(event.compute_time)
+        stats["select_us"].add(event.select_time)
+        stats["score"].add(event.score)
+        stats["allocation"].add(event.allocation)
+
+    def to_dict(self):
+        return {
+            method: {key: value.to_dict() if isinstance(value, Histogram) else value for key, value in stats.items()}
+            for method, stats in self.methods.items()
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def export(self, path: str):
+        with open(path, 'w') as stream:
+            json.dump(self.to_dict(), stream, indent=1)
@@ -0,0 +1,202 @@
+import time
+
+
+class ModiResult:
+    """
+    Optimal plan found by `modi_method`.
+
+    - `solution` Optimal allocation matrix.
+    - `total_cost` Cost of `solution`.
+    - `iterations` Number of pivots performed.
+    - `pivot_times` Seconds spent on every pivot (pricing + cycle + update).
+    """
+    def __init__(self, solution, total_cost, iterations, pivot_times):
+        self.solution = solution
+        self.total_cost = total_cost
+        self.iterations = iterations
+        self.pivot_times = pivot_times
+
+    @property
+    def elapsed(self) -> float:
+        return sum(self.pivot_times)
+
+
+class SpanningTreeBasis:
+    """
+    Basis of the transportation simplex kept as a spanning tree over m + n nodes.
+
+    Rows are nodes `0..m-1` and columns are nodes `m..m+n-1`; every basic cell (i, j) is
+    the edge between node `i` and node `m + j`. Potentials, parents and depths are filled
+    by one traversal from node 0, so both the u-v update and the cycle of an entering cell
+    (the tree path between its row and its column) cost O(m + n).
+
+    `solution` is an allocation matrix or a list of `(row, col, quantity)` cells. Past
+    `deadline` (a `time.perf_counter()` value) the construction raises `TimeoutError`.
+    """
+    def __init__(self, costs, solution, deadline: float = None):
+        self.costs = costs
+        self.m, self.n = len(costs), len(costs[0])
+        self.flow = {}
+        self.adj = [set() for _ in range(self.m + self.n)]
+
+        # Allocated cells first; a BFS has no cycles among them
+        parent = list(range(self.m + self.n))
+
+        def find(a):
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        def join(i, j, quantity):
+            a, b = find(i), find(self.m + j)
+            if a == b:
+                return False
+            parent[a] = b
+            self.add(i, j, quantity)
+            return True
+
+        if solution and isinstance(solution[0], tuple):
+            allocated = [cell for cell in solution if cell[2]]
+        else:
+            allocated = []
+            for i, row in enumerate(solution):
+                if deadline is not None and time.perf_counter() > deadline:
+                    raise TimeoutError()
+                allocated.extend((i, j, quantity) for j, quantity in enumerate(row) if quantity)
+        for i, j, quantity in allocated:
+            if not join(i, j, quantity):
+                raise ValueError("The solution is not basic (allocations form a cycle)")
+
+        # Degenerate solutions: connect the remaining components with zero-flow cells
+        for i in range(self.m):
+            if len(self.flow) == self.m + self.n - 1:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                raise TimeoutError()
+            for j in range(self.n):
+                join(i, j, 0)
+
+        self.update_potentials()
+
+    def add(self, i, j, quantity):
+        self.flow[(i, j)] = quantity
+        self.adj[i].add(self.m + j)
+        self.adj[self.m + j].add(i)
+
+    def remove(self, i, j):
+        del self.flow[(i, j)]
+        self.adj[i].discard(self.m + j)
+        self.adj[self.m + j].discard(i)
+
+    def update_potentials(self):
+        """u_i + v_j = c_ij on every basic cell, with u_0 = 0."""
+        m = self.m
+        potential = [0] * (m + self.n)
+        tree_parent = [-1] * (m + self.n)
+        depth = [0] * (m + self.n)
+        seen = [False] * (m + self.n)
+        seen[0] = True
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            for other in self.adj[node]:
+                if seen[other]:
+                    continue
+                seen[other] = True
+                if node < m:
+                    cost = self.costs[node][other - m]
+                else:
+                    cost = self.costs[other][node - m]
+                potential[other] = cost - potential[node]
+                tree_parent[other] = node
+                depth[other] = depth[node] + 1
+                stack.append(other)
+
+        self.u, self.v = potential[:m], potential[m:]
+        self.tree_parent, self.depth = tree_parent, depth
+
+    def entering_cell(self, deadline: float = None):
+        """
+        Non-basic cell with the most negative reduced cost c_ij - u_i - v_j (None if optimal).
+        Raises `TimeoutError` once `deadline` (a `time.perf_counter()` value) is passed.
+        """
+        best, best_cell = 0, None
+        v = self.v
+        for i, row in enumerate(self.costs):
+            if deadline is not None and time.perf_counter() > deadline:
+                raise TimeoutError()
+            ui = self.u[i]
+            for j, cost in enumerate(row):
+                reduced = cost - ui - v[j]
+                if reduced < best and (i, j) not in self.flow:
+                    best, best_cell = reduced, (i, j)
+        return best_cell
+
+    def cycle(self, i, j):
+        """Cells of the cycle closed by entering (i, j), starting with (i, j) itself."""
+        a, b = i, self.m + j
+        path_a, path_b = [a], [b]
+        depth, tree_parent = self.depth, self.tree_parent
+        while depth[a] > depth[b]:
+            a = tree_parent[a]
+            path_a.append(a)
+        while depth[b] > depth[a]:
+            b = tree_parent[b]
+            path_b.append(b)
+        while a != b:
+            a, b = tree_parent[a], tree_parent[b]
+            path_a.append(a)
+            path_b.append(b)
+
+        # Walk column j -> common ancestor -> row i, then close the loop at (i, j)
+        nodes = path_b + path_a[-2::-1]
+        cells = [(i, j)]
+        for x, y in zip(nodes, nodes[1:]):
+            cells.append((x, y - self.m) if x < self.m else (y, x - self.m))
+        return cells
+
+    def pivot(self, i, j):
+        cells = self.cycle(i, j)
+        minus = cells[1::2]
+        leaving = min(minus, key=self.flow.__getitem__)
+        theta = self.flow[leaving]
+
+        self.add(i, j, 0)
+        for cell in cells[0::2]:
+            self.flow[cell] += theta
+        for cell in minus:
+            self.flow[cell] -= theta
+        self.remove(*leaving)
+        self.update_potentials()
+
+    def solution(self):
+        solution = [[0] * self.n for _ in range(self.m)]
+        for (i, j), quantity in self.flow.items():
+            solution[i][j] = quantity
+        return solution
+
+
+def modi_method(costs, initial_solution, max_iterations: int = 100_000) -> ModiResult:
+    """
+    Implements the MODI (u-v) method to improve a basic feasible solution to the optimum.
+
+    - `costs` Cost matrix.
+    - `initial_solution` Allocation matrix from `nw_method`, `vogels_approximation_method`
+      or `russells_approximation_method` used as a warm start.
+
+    Returns `ModiResult`.
+    """
+    basis = SpanningTreeBasis(costs, initial_solution)
+    pivot_times = []
+
+    while len(pivot_times) < max_iterations:
+        start = time.perf_counter()
+        cell = basis.entering_cell()
+        if cell is None:
+            break
+        basis.pivot(*cell)
+        pivot_times.append(time.perf_counter() - start)
+
+    total_cost = sum(costs[i][j] * quantity for (i, j), quantity in basis.flow.items())
+    return ModiResult(basis.solution(), total_cost, len(pivot_times), pivot_times)
@@ -0,0 +1,472 @@
+"""
+Out-of-core Vogel's, Russell's and Least Cost methods over binary problem files.
+
+The cost matrix is never held in memory: `BlockFile` reads it in blocks of rows with
+plain file reads, and the methods keep only per-line summaries:
+
+- Vogel's: the two cheapest live cells of every row, and for every block the two
+  cheapest live cells of every column inside the block;
+- Russell's: the maximum of every row (Ui), for every block the maximum of every column
+  inside the block (Vj is the maximum over the blocks), and every row's best Δ;
+- Least Cost: the cheapest live cell of every row.
+
+When a row is exhausted only its own block is re-read to update the column summaries;
+when a column is exhausted only the blocks of the rows whose summaries referenced it are
+re-read. Allocations are the same as `vogels_approximation_method`,
+`russells_approximation_method` and `least_cost_method`.
+"""
+import heapq
+import sys
+import time
+from array import array
+from itertools import compress
+from operator import sub
+
+from combined_version import north_west_corner
+from dtypes import exact_quantities
+from problem_io import BINARY_HEADER, BINARY_MAGIC, BINARY_VERSION
+from report import SolveResult
+from validation import InfeasibleProblemError, NotApplicableError, NotBalancedError
+
+
+class BlockFile:
+    """
+    Binary problem file (see `problem_io.write_binary`) read `block_rows` cost rows at a time.
+
+    `supply` and `demand` are loaded at once; `bytes_read` and `blocks_read` count every read.
+    """
+    def __init__(self, path: str, block_rows: int = 256):
+        self.bytes_read = self.blocks_read = 0
+        self._file = open(path, 'rb')
+        try:
+            magic, version, byteorder, quantity_code, cost_code, m, n = BINARY_HEADER.unpack(
+                self._read(BINARY_HEADER.size))
+            if magic != BINARY_MAGIC or version != BINARY_VERSION:
+                raise ValueError(f"{path} is not a binary transportation problem")
+            if byteorder != sys.byteorder[0].encode():
+                raise ValueError(f"{path} was written with a different byte order")
+            self.m, self.n = m, n
+            self.block_rows = max(1, block_rows)
+            self.typecode = cost_code.decode()
+            self.supply = exact_quantities(self._read_array(quantity_code.decode(), m))
+            self.demand = exact_quantities(self._read_array(quantity_code.decode(), n))
+        except (ValueError, EOFError):
+            self._file.close()
+            raise
+        self._offset = self._file.tell()
+        self._row_bytes = n * array(self.typecode).itemsize
+
+    def _read(self, size: int) -> bytes:
+        data = self._file.read(size)
+        if len(data) != size:
+            raise EOFError(f"{self._file.name} is truncated")
+        self.bytes_read += size
+        return data
+
+    def _read_array(self, typecode, count):
+        values = array(typecode)
+        values.frombytes(self._read(count * values.itemsize))
+        return values.tolist()
+
+    @property
+    def block_count(self) -> int:
+        return -(-self.m // self.block_rows)
+
+    def block_of(self, i: int) -> int:
+        return i // self.block_rows
+
+    def read_block(self, b: int):
+        """Rows of block `b` as `memoryview`s over one freshly read buffer."""
+        first = b * self.block_rows
+        count = min(self.block_rows, self.m - first)
+        self._file.seek(self._offset + first * self._row_bytes)
+        flat = array(self.typecode)
+        flat.frombytes(self._read(count * self._row_bytes))
+        self.blocks_read += 1
+        view, n = memoryview(flat), self.n
+        return [view[k * n:(k + 1) * n] for k in range(count)]
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _Blocks:
+    # Blocks read during one step, so a block needed twice is read once
+    def __init__(self, source: BlockFile):
+        self.source = source
+        self.loaded = {}
+
+    def rows(self, b):
+        rows = self.loaded.get(b)
+        if rows is None:
+            rows = self.loaded[b] = self.source.read_block(b)
+        return rows
+
+    def row(self, i):
+        return self.rows(self.source.block_of(i))[i % self.source.block_rows]
+
+
+def _best(heap, alive, penalties):
+    # Largest penalty, lowest index on ties; drops stale heap entries
+    while heap:
+        penalty, k = heap[0]
+        if alive[k] and penalties[k] == -penalty:
+            return k
+        heapq.heappop(heap)
+    return None
+
+
+def chunked_vogel(source: BlockFile):
+    """
+    Vogel's approximation reading the costs block by block (see the module docstring).
+
+    Yields `(i, j, allocation, cost)` in the same order as `vogels_approximation_method`.
+    """
+    supply, demand = list(source.supply), list(source.demand)
+    m, n, size = source.m, source.n, source.block_rows
+    row_alive = [s > 0 for s in supply]
+    col_alive = [d > 0 for d in demand]
+    rows_left, cols_left = sum(row_alive), sum(col_alive)
+
+    row_top = [[] for _ in range(m)]  # two cheapest live (cost, column) of each row
+    col_top = [[] for _ in range(n)]  # two cheapest live (cost, row) of each column
+    block_top = [None] * source.block_count  # same per block, for every column
+    col_watch = [set() for _ in range(n)]  # rows whose top-two cells sit in column j
+    row_watch = [set() for _ in range(m)]  # columns whose block top-two cells sit in row i
+    row_pen, col_pen = [-1] * m, [-1] * n
+    row_heap, col_heap = [], []
+
+    def set_penalty(k, top, penalties, heap):
+        if not top:
+            raise InfeasibleProblemError()
+        penalty = top[1][0] - top[0][0] if len(top) > 1 else float('inf')
+        if penalty != penalties[k]:
+            penalties[k] = penalty
+            heapq.heappush(heap, (-penalty, k))
+
+    def refresh_row(i, row):
+        top = row_top[i] = heapq.nsmallest(2, compress(zip(row, range(n)), col_alive))
+        for _, j in top:
+            col_watch[j].add(i)
+        set_penalty(i, top, row_pen, row_heap)
+
+    def refresh_block(b, rows, columns):
+        # Block top-two of `columns` (all of them if None) over the live rows of block b
+        first = b * size
+        live = row_alive[first:first + len(rows)]
+        tops = block_top[b]
+        if columns is None:
+            for j, values in enumerate(zip(*rows)):
+                tops[j] = heapq.nsmallest(2, compress(zip(values, range(first, first + len(rows))), live))
+                for _, i in tops[j]:
+                    row_watch[i].add(j)
+        else:
+            for j in columns:
+                tops[j] = heapq.nsmallest(2, ((rows[k][j], first + k) for k in range(len(rows)) if live[k]))
+                for _, i in tops[j]:
+                    row_watch[i].add(j)
+
+    def refresh_col(j):
+        col_top[j] = heapq.nsmallest(2, (cell for tops in block_top for cell in tops[j]))
+        set_penalty(j, col_top[j], col_pen, col_heap)
+
+    for b in range(source.block_count):
+        rows = source.read_block(b)
+        for k, row in enumerate(rows):
+            if min(row, default=1) <= 0:
+                raise NotApplicableError()
+            if row_alive[b * size + k]:
+                refresh_row(b * size + k, row)
+        block_top[b] = [None] * n
+        refresh_block(b, rows, None)
+    for j in range(n):
+        if col_alive[j]:
+            refresh_col(j)
+
+    while rows_left and cols_left:
+        row_index = _best(row_heap, row_alive, row_pen)
+        col_index = _best(col_heap, col_alive, col_pen)
+        if row_pen[row_index] >= col_pen[col_index]:
+            cost, col_index = row_top[row_index][0]
+        else:
+            cost, row_index = col_top[col_index][0]
+
+        allocation = min(supply[row_index], demand[col_index])
+        supply[row_index] -= allocation
+        demand[col_index] -= allocation
+        yield row_index, col_index, allocation, cost
+
+        row_done = supply[row_index] == 0
+        col_done = demand[col_index] == 0
+        if row_done:
+            row_alive[row_index] = False
+            rows_left -= 1
+        if col_done:
+            col_alive[col_index] = False
+            cols_left -= 1
+        if not (rows_left and cols_left):
+            break
+
+        blocks = _Blocks(source)
+        if row_done:
+            columns = [j for j in row_watch[row_index] if col_alive[j]]
+            row_watch[row_index].clear()
+            if columns:
+                b = source.block_of(row_index)
+                refresh_block(b, blocks.rows(b), columns)
+                # Block cells only get more expensive, so a column's top-two only changes if it held the row
+                for j in columns:
+                    if any(i == row_index for _, i in col_top[j]):
+                        refresh_col(j)
+        if col_done:
+            for i in sorted(i for i in col_watch[col_index] if row_alive[i]):
+                refresh_row(i, blocks.row(i))
+            col_watch[col_index].clear()
+
+
+def chunked_russell(source: BlockFile):
+    """
+    Russell's approximation reading the costs block by block (see the module docstring).
+
+    Yields `(i, j, allocation, cost)` in the same order as `russells_approximation_method`.
+    """
+    supply, demand = list(source.supply), list(source.demand)
+    m, n, size = source.m, source.n, source.block_rows
+    row_alive = [s > 0 for s in supply]
+    col_alive = [d > 0 for d in demand]
+    rows_left, cols_left = sum(row_alive), sum(col_alive)
+
+    U = [float('-inf')] * m
+    V = [float('-inf')] * n
+    block_max = [None] * source.block_count  # per block, live (max cost, row) of every column
+    col_hi_watch = [set() for _ in range(n)]  # rows whose max sits in column j
+    row_hi_watch = [set() for _ in range(m)]  # columns whose block max sits in row i
+    row_best = [None] * m  # (cost, column) of the smallest c_ij - Vj
+    best_watch = [set() for _ in range(n)]  # rows whose best cell sits in column j
+    stamp = [0] * m
+    heap = []
+
+    def update_row_max(i, row):
+        top = max(compress(zip(row, range(n)), col_alive), default=None)
+        if top is None:
+            raise InfeasibleProblemError()
+        U[i] = top[0]
+        col_hi_watch[top[1]].add(i)
+
+    def update_block_max(b, rows, columns):
+        first = b * size
+        live = row_alive[first:first + len(rows)]
+        maxima = block_max[b]
+        if columns is None:
+            for j, values in enumerate(zip(*rows)):
+                maxima[j] = max(compress(zip(values, range(first, first + len(rows))), live), default=None)
+                if maxima[j] is not None:
+                    row_hi_watch[maxima[j][1]].add(j)
+        else:
+            for j in columns:
+                maxima[j] = max(((rows[k][j], first + k) for k in range(len(rows)) if live[k]), default=None)
+                if maxima[j] is not None:
+                    row_hi_watch[maxima[j][1]].add(j)
+
+    def update_col_max(j):
+        top = max((maxima[j] for maxima in block_max if maxima[j] is not None), default=None)
+        if top is None:
+            raise InfeasibleProblemError()
+        changed = top[0] != V[j]
+        V[j] = top[0]
+        return changed
+
+    def update_row_best(i, row):
+        # Lowest column on ties, like the row-major scan of the original method
+        key, j = min(compress(zip(map(sub, row, V), range(n)), col_alive))
+        row_best[i] = (row[j], j)
+        best_watch[j].add(i)
+
+    def push(i):
+        cost, j = row_best[i]
+        stamp[i] += 1
+        heapq.heappush(heap, (cost - (U[i] + V[j]), i, stamp[i]))
+
+    # First pass: Ui and the block maxima; second pass (Vj known): every row's best cell
+    for b in range(source.block_count):
+        rows = source.read_block(b)
+        for k, row in enumerate(rows):
+            if min(row, default=1) <= 0:
+                raise NotApplicableError()
+            if row_alive[b * size + k]:
+                update_row_max(b * size + k, row)
+        block_max[b] = [None] * n
+        update_block_max(b, rows, None)
+    for j in range(n):
+        if col_alive[j]:
+            update_col_max(j)
+    for b in range(source.block_count):
+        for k, row in enumerate(source.read_block(b)):
+            if row_alive[b * size + k]:
+                update_row_best(b * size + k, row)
+                push(b * size + k)
+
+    while rows_left and cols_left:
+        while True:
+            min_delta, min_i, version = heap[0]
+            if row_alive[min_i] and stamp[min_i] == version:
+                break
+            heapq.heappop(heap)
+        cost, min_j = row_best[min_i]
+
+        allocation = min(supply[min_i], demand[min_j])
+        supply[min_i] -= allocation
+        demand[min_j] -= allocation
+        yield min_i, min_j, allocation, cost
+
+        row_done = supply[min_i] == 0
+        col_done = demand[min_j] == 0
+        if row_done:
+            row_alive[min_i] = False
+            rows_left -= 1
+        if col_done:
+            col_alive[min_j] = False
+            cols_left -= 1
+        if not (rows_left and cols_left):
+            break
+
+        blocks = _Blocks(source)
+        shifted, rescan = set(), set()
+        if row_done:
+            # Columns whose max was in this row may get a smaller Vj
+            columns = [j for j in row_hi_watch[min_i] if col_alive[j]]
+            row_hi_watch[min_i].clear()
+            if columns:
+                b = source.block_of(min_i)
+                # Only columns whose Vj came from this block's maximum can change
+                columns = [(j, block_max[b][j][0] == V[j]) for j in columns]
+                update_block_max(b, blocks.rows(b), [j for j, _ in columns])
+                for j, held in columns:
+                    if held and update_col_max(j):
+                        rescan.update(i for i in best_watch[j] if row_alive[i])
+        if col_done:
+            # Rows whose max was in this column get a smaller Ui
+            for i in col_hi_watch[min_j]:
+                if row_alive[i]:
+                    update_row_max(i, blocks.row(i))
+                    shifted.add(i)
+            col_hi_watch[min_j].clear()
+            rescan.update(i for i in best_watch[min_j] if row_alive[i])
+            best_watch[min_j].clear()
+
+        for i in sorted(rescan):
+            best_watch[row_best[i][1]].discard(i)
+            update_row_best(i, blocks.row(i))
+        for i in shifted | rescan:
+            push(i)
+
+
+def chunked_least_cost(source: BlockFile):
+    """
+    Least Cost method reading the costs block by block: every row keeps its cheapest live
+    cell, and when a column is exhausted only the blocks of the rows whose cell sat in it
+    are re-read.
+
+    Yields `(i, j, allocation, cost)` in the same order as `least_cost_method`.
+    """
+    supply, demand = list(source.supply), list(source.demand)
+    m, n, size = source.m, source.n, source.block_rows
+    row_alive = [s > 0 for s in supply]
+    col_alive = [d > 0 for d in demand]
+    rows_left, cols_left = sum(row_alive), sum(col_alive)
+
+    row_best = [None] * m  # (cost, column) of the cheapest live cell
+    best_watch = [set() for _ in range(n)]  # rows whose cheapest cell sits in column j
+    heap = []
+
+    def update_row_best(i, row):
+        best = min(compress(zip(row, range(n)), col_alive), default=None)
+        if best is None:
+            raise InfeasibleProblemError()
+        row_best[i] = best
+        best_watch[best[1]].add(i)
+        heapq.heappush(heap, (best[0], i, best[1]))
+
+    for b in range(source.block_count):
+        for k, row in enumerate(source.read_block(b)):
+            if min(row, default=1) <= 0:
+                raise NotApplicableError()
+            if row_alive[b * size + k] and cols_left:
+                update_row_best(b * size + k, row)
+
+    while rows_left and cols_left:
+        # Cheapest cell, first in row-major order on ties; drops stale heap entries
+        while True:
+            cost, i, j = heap[0]
+            if row_alive[i] and row_best[i] == (cost, j):
+                break
+            heapq.heappop(heap)
+
+        allocation = min(supply[i], demand[j])
+        supply[i] -= allocation
+        demand[j] -= allocation
+        yield i, j, allocation, cost
+
+        if supply[i] == 0:
+            row_alive[i] = False
+            rows_left -= 1
+        if demand[j] == 0:
+            col_alive[j] = False
+            cols_left -= 1
+            if rows_left and cols_left:
+                blocks = _Blocks(source)
+                for k in sorted(k for k in best_watch[j] if row_alive[k]):
+                    update_row_best(k, blocks.row(k))
+            best_watch[j].clear()
+
+
+class OutOfCoreResult(SolveResult):
+    """
+    `SolveResult` of `solve_out_of_core`; `solution` holds `(row, col, quantity)` cells and
+    `costs` is None (the matrix stays on disk), so `total_cost` is filled in by the solve.
+
+    - `bytes_read` Bytes read from the file, header and quantities included.
+    - `blocks_read` Blocks of rows read.
+    """
+    def __init__(self, method, solution, elapsed, total_cost, bytes_read, blocks_read):
+        super().__init__(method, solution, None, elapsed, total_cost=total_cost)
+        self.bytes_read = bytes_read
+        self.blocks_read = blocks_read
+
+
+def solve_out_of_core(path: str, method: str, block_rows: int = 256) -> OutOfCoreResult:
+    """
+    Solves a binary problem file with "nw", "vogel", "russell" or "least_cost" without loading the costs.
+
+    Raises `NotBalancedError`/`NotApplicableError` like the solver (costs are checked
+    while they are read).
+    """
+    start = time.perf_counter()
+    with BlockFile(path, block_rows) as source:
+        if sum(source.supply) != sum(source.demand):
+            raise NotBalancedError()
+        if method == "nw":
+            cells = north_west_corner(source.supply, source.demand)
+            total_cost, loaded, rows = 0, None, None
+            for i, j, quantity in cells:
+                if quantity:
+                    if source.block_of(i) != loaded:
+                        loaded = source.block_of(i)
+                        rows = source.read_block(loaded)
+                    total_cost += rows[i % source.block_rows][j] * quantity
+        elif method in ("vogel", "russell", "least_cost"):
+            engine = {"vogel": chunked_vogel, "russell": chunked_russell, "least_cost": chunked_least_cost}[method]
+            cells, total_cost = [], 0
+            for i, j, quantity, cost in engine(source):
+                cells.append((i, j, quantity))
+                total_cost += cost * quantity
+        else:
+            raise ValueError(f"Unknown method {method!r}")
+        return OutOfCoreResult(method, cells, time.perf_counter() - start, total_cost,
+                               source.bytes_read, source.blocks_read)
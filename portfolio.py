@@ -0,0 +1,105 @@
+import multiprocessing
+import queue
+import time
+
+from combined_version import METHODS
+from report import SolveResult
+from validation import TransportationProblemError
+
+
+class PortfolioResult:
+    """
+    Outcome of `run_portfolio`.
+
+    - `best` `SolveResult` of the cheapest method that finished (None if none did).
+    - `total_costs` Total cost of every method that finished.
+    - `wall_times` Seconds from the start of the portfolio to each method's result.
+    - `errors` Message of every method that failed.
+    - `cancelled` Methods stopped when the budget ran out.
+    """
+    def __init__(self, best, total_costs, wall_times, errors, cancelled):
+        self.best = best
+        self.total_costs = total_costs
+        self.wall_times = wall_times
+        self.errors = errors
+        self.cancelled = cancelled
+
+    @property
+    def winner(self):
+        return self.best.method if self.best is not None else None
+
+
+def _run_method(solver, method, results):
+    # Runs in a child process; only the basic cells travel back
+    try:
+        result = solver.solve(method)
+    except TransportationProblemError as error:
+        results.put((method, None, None, 0.0, str(error)))
+        return
+    cells = [(i, j, q) for i, row in enumerate(result.solution) for j, q in enumerate(row) if q]
+    results.put((method, cells, result.total_cost, result.elapsed, None))
+
+
+def run_portfolio(solver, methods=None, budget: float = None, poll: float = 0.05) -> PortfolioResult:
+    """
+    Runs several methods of `solver` at once, one process each, and keeps the cheapest plan.
+
+    - `methods` Names from `METHODS` (all of them by default).
+    - `budget` Seconds after which the methods still running are terminated; the best
+      plan found so far is returned (None = wait for every method).
+    - `poll` Seconds between checks for crashed children.
+
+    Children are forked where the platform allows it, so they read the solver's cost data
+    in place instead of receiving a pickled copy. Ties go to the first method in `methods`.
+    """
+    methods = list(methods or METHODS)
+    for method in methods:
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}, expected one of {', '.join(METHODS)}")
+
+    fork = "fork" in multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if fork else None)
+    results = context.Queue()
+    start = time.perf_counter()
+    processes = {method: context.Process(target=_run_method, args=(solver, method, results), daemon=True)
+                 for method in methods}
+    for process in processes.values():
+        process.start()
+
+    finished, total_costs, wall_times, errors = {}, {}, {}, {}
+    pending = set(methods)
+    while pending:
+        remaining = None if budget is None else budget - (time.perf_counter() - start)
+        if remaining is not None and remaining <= 0:
+            break
+        try:
+            method, cells, total_cost, elapsed, error = results.get(timeout=min(poll, remaining or poll))
+        except queue.Empty:
+            for method in list(pending):
+                if processes[method].exitcode not in (None, 0):
+                    errors[method] = f"Worker exited with code {processes[method].exitcode}"
+                    pending.discard(method)
+            continue
+        wall_times[method] = time.perf_counter() - start
+        pending.discard(method)
+        if error is not None:
+            errors[method] = error
+            continue
+        finished[method] = (cells, elapsed)
+        total_costs[method] = total_cost
+
+    for method in pending:
+        processes[method].terminate()
+    for process in processes.values():
+        process.join()
+    results.close()
+
+    best = None
+    if total_costs:
+        winner = min((method for method in methods if method in total_costs), key=total_costs.get)
+        cells, elapsed = finished[winner]
+        solution = [[0] * len(solver.demand) for _ in solver.supply]
+        for i, j, quantity in cells:
+            solution[i][j] = quantity
+        best = SolveResult(winner, solution, solver.costs, elapsed, solver.dummy_flow(solution), total_costs[winner])
+    return PortfolioResult(best, total_costs, wall_times, errors, sorted(pending, key=methods.index))
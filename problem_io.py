@@ -0,0 +1,305 @@
+"""
+Reading and writing transportation problems in bulk.
+
+Text format (the same order as the interactive input, so a session can be replayed):
+
+    # comments and blank lines are ignored
+    7 9 18              <- supply, m values
+    5 8 7 14            <- demand, n values
+    19 30 50 10         <- m rows of n costs
+    70 30 40 60
+    40 8 70 20
+
+The CSV format has the same layout with comma-separated values.
+Costs are parsed straight into one `array` per row and `read_problem` narrows the matrix
+to the smallest safe typecode (see `dtypes`), so it never exists as lists of Python ints.
+Fractional supplies/demands are read as exact `Fraction`s.
+
+The binary format (see `write_binary`/`open_binary`) is a 32-byte header followed by the
+supply, the demand and the row-major cost block in native byte order; it is opened with
+`mmap` and the solver reads the costs in place.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from dtypes import compact_costs, cost_typecode as matrix_typecode, exact_quantities
+
+
+def _parse_values(line: str, separator):
+    try:
+        return array('q', map(int, line.split(separator)))
+    except OverflowError:
+        return list(map(int, line.split(separator)))  # beyond int64: keep Python ints
+    except ValueError:
+        return array('d', map(float, line.split(separator)))
+
+
+def _content_lines(stream, separator):
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if separator is not None:
+            line = line.rstrip(separator)
+        yield number, line
+
+
+def iter_problem(stream, fmt: str = "text"):
+    """
+    Streams a problem from a text stream (see the module docstring).
+
+    - `fmt` "text" (whitespace-separated) or "csv".
+
+    Returns `supply`, `demand` as lists and an iterator over the cost rows as `array`s
+    ('q' or 'd'; lists for integers beyond int64).
+    The iterator raises `ValueError` with the line number as soon as a row has the wrong size.
+    """
+    if fmt not in ("text", "csv"):
+        raise ValueError(f"Unknown input format {fmt!r}")
+    separator = ',' if fmt == "csv" else None
+    lines = _content_lines(stream, separator)
+
+    try:
+        _, line = next(lines)
+        supply = exact_quantities(_parse_values(line, separator))
+        _, line = next(lines)
+        demand = exact_quantities(_parse_values(line, separator))
+    except StopIteration:
+        raise ValueError("The input must start with the supply and the demand lines") from None
+
+    def rows(m, n):
+        count = 0
+        for number, line in lines:
+            if count == m:
+                raise ValueError(f"Line {number}: expected only {m} cost rows")
+            row = _parse_values(line, separator)
+            if len(row) != n:
+                raise ValueError(f"Line {number}: expected {n} costs, got {len(row)}")
+            count += 1
+            yield row
+        if count != m:
+            raise ValueError(f"Expected {m} cost rows, got {count}")
+
+    return supply, demand, rows(len(supply), len(demand))
+
+
+def iter_scenarios(stream, fmt: str = "text"):
+    """
+    Streams `(supply, demand)` scenarios from a text stream: pairs of a supply and a demand
+    line, with the comments and blank lines of the problem format. Raises `ValueError`
+    if the last supply line has no demand line.
+    """
+    if fmt not in ("text", "csv"):
+        raise ValueError(f"Unknown input format {fmt!r}")
+    separator = ',' if fmt == "csv" else None
+    lines = _content_lines(stream, separator)
+    for number, line in lines:
+        supply = exact_quantities(_parse_values(line, separator))
+        try:
+            _, line = next(lines)
+        except StopIteration:
+            raise ValueError(f"Line {number}: the supply has no demand line") from None
+        yield supply, exact_quantities(_parse_values(line, separator))
+
+
+def read_problem(stream, fmt: str = "text"):
+    """
+    Reads `supply`, `demand` and `costs` from a text stream (see `iter_problem`).
+
+    Returns `supply`, `demand` as lists and `costs` as a list of `array` rows in the
+    narrowest typecode of the whole matrix (one fractional row makes it 'd').
+    """
+    supply, demand, rows = iter_problem(stream, fmt)
+    return supply, demand, compact_costs(list(rows))
+
+
+def guess_format(path: str) -> str:
+    if path.lower().endswith(".csv"):
+        return "csv"
+    if path.lower().endswith(BINARY_EXTENSION):
+        return "binary"
+    return "text"
+
+
+def load_problem(path: str, fmt: str = None):
+    """
+    Reads a problem from `path` ("-" for stdin); the format defaults to the file extension.
+    Binary files are memory mapped; the map stays open as long as the cost rows are used.
+    """
+    fmt = fmt or guess_format(path)
+    if fmt == "binary":
+        problem = open_binary(path)
+        return problem.supply, problem.demand, problem.costs
+    if path == "-":
+        return read_problem(sys.stdin, fmt)
+    with open(path) as stream:
+        return read_problem(stream, fmt)
+
+
+def write_problem(stream, supply, demand, costs, fmt: str = "text"):
+    """Writes a problem in the format read by `read_problem`."""
+    separator = ',' if fmt == "csv" else ' '
+    stream.write(separator.join(map(str, supply)) + '\n')
+    stream.write(separator.join(map(str, demand)) + '\n')
+    for row in costs:
+        stream.write(separator.join(map(str, row)) + '\n')
+
+
+# Binary format: magic, version, byte order, quantity typecode, cost typecode, m, n
+BINARY_MAGIC = b"TPRB"
+BINARY_EXTENSION = ".tpb"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sHccc7xQQ")  # padded to 32 bytes so the data is aligned
+
+
+class MappedProblem:
+    """
+    Problem opened from the binary format with `open_binary`.
+
+    `costs` is a list of `memoryview` rows over the mapped file, so it can be passed to
+    `BalancedProlemSolver` like a list of lists without loading the matrix.
+    """
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"{path} is truncated") from None
+        if len(self._map) < BINARY_HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        magic, version, byteorder, quantity_code, cost_code, m, n = BINARY_HEADER.unpack_from(self._map)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a binary transportation problem")
+        if byteorder != sys.byteorder[0].encode():
+            self.close()
+            raise ValueError(f"{path} was written with a different byte order")
+
+        quantity_code, cost_code = quantity_code.decode(), cost_code.decode()
+        quantity_size = array(quantity_code).itemsize
+        if len(self._map) < BINARY_HEADER.size + (m + n) * quantity_size + m * n * array(cost_code).itemsize:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        offset = BINARY_HEADER.size
+        data = memoryview(self._map)
+        self.supply = exact_quantities(data[offset:offset + m * quantity_size].cast(quantity_code).tolist())
+        offset += m * quantity_size
+        self.demand = exact_quantities(data[offset:offset + n * quantity_size].cast(quantity_code).tolist())
+        offset += n * quantity_size
+        flat = data[offset:offset + m * n * array(cost_code).itemsize].cast(cost_code)
+        self.costs = [flat[i * n:(i + 1) * n] for i in range(m)]
+
+    def close(self):
+        # Views must be released before the map can be closed
+        self.costs = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # a caller still holds a row; the map is closed when it is collected
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _widen_to_double(stream, start: int, count: int, chunk: int = 1 << 16):
+    # Rewrites `count` int64 costs from byte `start` as float64 in place: both take 8 bytes
+    end = stream.tell()
+    for offset in range(0, count, chunk):
+        stream.seek(start + offset * 8)
+        block = array('q')
+        block.fromfile(stream, min(chunk, count - offset))
+        stream.seek(start + offset * 8)
+        array('d', block).tofile(stream)
+    stream.seek(end)
+
+
+def write_binary(path: str, supply, demand, rows, cost_typecode: str = None, quantity_typecode: str = None):
+    """
+    Writes a problem in the binary format. `rows` may be any iterable of cost rows, so a
+    text file can be converted without holding the matrix in memory.
+
+    - `cost_typecode` Defaults to the narrowest one for a list of rows (see `dtypes`). Other
+      iterables, whose range is unknown before they are written, are written as 'q' and
+      switched to 'd' (rewriting the rows already written) at the first fractional row.
+    - `quantity_typecode` Defaults to 'q', or 'd' for fractional quantities.
+
+    Raises `ValueError` for costs beyond int64.
+    """
+    m, n = len(supply), len(demand)
+    widen = False
+    if cost_typecode is None:
+        if isinstance(rows, list):
+            cost_typecode = matrix_typecode(rows)
+        else:
+            cost_typecode, widen = 'q', True
+    if cost_typecode is None:
+        raise ValueError("Costs beyond int64 cannot be stored in the binary format")
+    if quantity_typecode is None:
+        integral = all(isinstance(value, int) for value in (*supply, *demand))
+        quantity_typecode = 'q' if integral else 'd'
+
+    def header():
+        return BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, sys.byteorder[0].encode(),
+                                  quantity_typecode.encode(), cost_typecode.encode(), m, n)
+
+    with open(path, 'w+b') as stream:
+        stream.write(header())
+        array(quantity_typecode, supply).tofile(stream)
+        array(quantity_typecode, demand).tofile(stream)
+        start, written = stream.tell(), 0
+        for row in rows:
+            if not isinstance(row, array) or row.typecode != cost_typecode:
+                try:
+                    row = array(cost_typecode, row)
+                except OverflowError:
+                    raise ValueError("Costs beyond int64 cannot be stored in the binary format") from None
+                except TypeError:
+                    if not widen:
+                        raise ValueError(f"Cost row {written // n} is fractional, "
+                                         f"it cannot be stored with typecode {cost_typecode!r}") from None
+                    _widen_to_double(stream, start, written)
+                    cost_typecode, widen = 'd', False
+                    end = stream.tell()
+                    stream.seek(0)
+                    stream.write(header())
+                    stream.seek(end)
+                    row = array(cost_typecode, row)
+            row.tofile(stream)
+            written += len(row)
+
+
+def open_binary(path: str) -> MappedProblem:
+    """Maps a binary problem file; use it as a context manager or call `close()`."""
+    return MappedProblem(path)
+
+
+def convert_to_binary(source: str, destination: str, fmt: str = None, cost_typecode: str = None):
+    """
+    Streams a text/CSV problem file into the binary format row by row.
+
+    - `cost_typecode` Defaults to 'q', or 'd' if any cost is fractional (see `write_binary`).
+    """
+    with open(source) as stream:
+        supply, demand, rows = iter_problem(stream, fmt or guess_format(source))
+        write_binary(destination, supply, demand, rows, cost_typecode)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Converts a text/CSV problem to the binary format")
+    parser.add_argument("source")
+    parser.add_argument("destination")
+    parser.add_argument("--format", choices=["text", "csv"])
+    parser.add_argument("--cost-typecode", help="array typecode of the costs ('q', 'i', 'd', ...; default: 'q', or 'd' for fractional costs)")
+    args = parser.parse_args()
+    convert_to_binary(args.source, args.destination, args.format, args.cost_typecode)
@@ -1,4 +1,4 @@
-def russells_approximation_method(supply, demand, costs):
+def russells_approximation_method(supply, demand, costs, verbose=True):
     m, n = len(supply), len(demand)
     solution = [[0] * n for _ in range(m)]  # Initialize solution matrix
 
@@ -12,9 +12,10 @@ def russells_approximation_method(supply, demand, costs):
         # Step 3: Compute reduced cost Δij
         delta = [[costs[i][j] - (Ui[i] + Vj[j]) for j in range(n)] for i in range(m)]
 
-        # Print current state
-        print("Current Table:")
-        print_table(costs, delta, supply, demand, Ui, Vj)
+        # Print current state (skipped, with its formatting work, when not verbose)
+        if verbose:
+            print("Current Table:")
+            print_table(costs, delta, supply, demand, Ui, Vj)
 
         # Step 4: Find the most negative Δij
         min_delta = float('inf')
@@ -24,7 +25,8 @@ def russells_approximation_method(supply, demand, costs):
                 if demand[j] > 0 and supply[i] > 0 and delta[i][j] < min_delta:
                     min_delta = delta[i][j]
                     min_i, min_j = i, j
-        print(f"!!! The MOST negative is {costs[min_i][min_j]}")
+        if verbose:
+            print(f"!!! The MOST negative is {costs[min_i][min_j]}")
 
         # Step 5: Allocate as much as possible
         if min_i != -1 and min_j != -1:
@@ -34,7 +36,8 @@ def russells_approximation_method(supply, demand, costs):
             demand[min_j] -= allocation_amount
 
             # Print allocation
-            print(f"Allocating {allocation_amount} from S{min_i + 1} to D{min_j + 1}")
+            if verbose:
+                print(f"Allocating {allocation_amount} from S{min_i + 1} to D{min_j + 1}")
 
             # Mark rows/columns exhausted
             if supply[min_i] == 0:
@@ -0,0 +1,151 @@
+import sys
+
+# Verbosity levels of `Report`
+SILENT = 0   # nothing is formatted or written
+SUMMARY = 1  # headers and total costs
+FULL = 2     # tables, solution matrices and total cost equations
+
+
+class SolveResult:
+    """
+    Result of `BalancedProlemSolver.solve`; nothing is formatted until a `Report` renders it.
+
+    - `method` Method name.
+    - `solution` Allocation matrix (or `(row, col, quantity)` cells for compact results).
+    - `costs` Cost matrix the solution refers to.
+    - `elapsed` Seconds spent by the method.
+    - `dummy_flow` Quantity sent to the dummy line of an auto-balanced problem.
+    - `total_cost` Known total cost (e.g. from a cache); computed on first use otherwise.
+    """
+    def __init__(self, method, solution, costs, elapsed, dummy_flow=0, total_cost=None):
+        self.method = method
+        self.solution = solution
+        self.costs = costs
+        self.elapsed = elapsed
+        self.dummy_flow = dummy_flow
+        self._total_cost = total_cost
+
+    def cells(self):
+        """Allocated cells as `(row, col, quantity)`."""
+        if self.solution and isinstance(self.solution[0], tuple):
+            return [cell for cell in self.solution if cell[2]]
+        return [(i, j, q) for i, row in enumerate(self.solution) for j, q in enumerate(row) if q]
+
+    @property
+    def total_cost(self):
+        if self._total_cost is None:
+            self._total_cost = sum(self.costs[i][j] * q for i, j, q in self.cells())
+        return self._total_cost
+
+
+def _shown(count: int, limit: int):
+    # Indices to show when only `limit` entries fit: the head, None for the gap, the tail
+    if limit is None or count <= limit:
+        return list(range(count))
+    head = (limit + 1) // 2
+    return list(range(head)) + [None] + list(range(count - (limit - head), count))
+
+
+class Report:
+    """
+    Renders inputs and results with a verbosity level, truncation and buffered writes.
+
+    - `stream` Where the text goes (stdout by default).
+    - `verbosity` `SILENT`, `SUMMARY` or `FULL`; with `SILENT` every method returns at once.
+    - `max_rows`, `max_cols` Larger tables and matrices show their first and last rows/columns
+      around a "..." marker (None = no limit).
+    - `max_terms` Longer total cost equations are replaced by the number of terms.
+    - `buffer_size` Characters collected before they are written to `stream`.
+
+    Small problems are rendered exactly like the original `print` based output.
+    """
+    def __init__(self, stream=None, verbosity: int = FULL, max_rows: int = 20, max_cols: int = 12,
+                 max_terms: int = 50, buffer_size: int = 1 << 16):
+        self.stream = stream
+        self.verbosity = verbosity
+        self.max_rows = max_rows
+        self.max_cols = max_cols
+        self.max_terms = max_terms
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._buffered = 0
+
+    def write(self, text: str):
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            stream = self.stream or sys.stdout
+            stream.write(''.join(self._buffer))
+            stream.flush()
+            self._buffer.clear()
+            self._buffered = 0
+
+    def line(self, text: str = "", level: int = SUMMARY):
+        if self.verbosity >= level:
+            self.write(text + '\n')
+
+    def input_table(self, costs, supply, demand):
+        """Input parameter table (cost matrix C, supply S, demand D)."""
+        if self.verbosity < FULL:
+            return
+        rows, cols = _shown(len(supply), self.max_rows), _shown(len(demand), self.max_cols)
+        separator = "------------------------------------------------------"
+        parts = ["\nInput Parameter Table:\n", separator, "\ndem\\sup | "]
+        parts += ["... | " if j is None else f"Dest {j + 1} | " for j in cols]
+        parts += ["supply\n", separator, "\n"]
+        for i in rows:
+            if i is None:
+                parts.append("  ...\n")
+                continue
+            row = costs[i]
+            parts.append(f"  Src {(i + 1):<3} | ")
+            parts += ["...    | " if j is None else f"{row[j]:<6} | " for j in cols]
+            parts.append(f"{supply[i]}\n")
+        parts += [separator, "\n  Demand: | "]
+        parts += [" ...   | " if j is None else f" {demand[j]:<5} | " for j in cols]
+        parts += ["\n", separator, "\n"]
+        self.write(''.join(parts))
+
+    def solution(self, solution):
+        """Solution matrix, or the `(row, col, quantity)` list of a compact solution."""
+        if self.verbosity < FULL:
+            return
+        parts = ["\nSolution Matrix:\n"]
+        if solution and isinstance(solution[0], tuple):
+            shown = _shown(len(solution), self.max_rows)
+            parts += ["...\n" if k is None else f"{solution[k]}\n" for k in shown]
+        else:
+            cols = _shown(len(solution[0]), self.max_cols) if solution else []
+            for i in _shown(len(solution), self.max_rows):
+                if i is None:
+                    parts.append("...\n")
+                else:
+                    # Same as the list repr for ints and floats; fractions show as 1/10
+                    row = solution[i]
+                    parts.append("[" + ", ".join("..." if j is None else str(row[j]) for j in cols) + "]\n")
+        self.write(''.join(parts))
+
+    def total_cost(self, result: SolveResult):
+        """Total cost line, as an equation of every allocated cell when it is short enough."""
+        if self.verbosity < SUMMARY:
+            return
+        cells = result.cells() if self.verbosity >= FULL else None
+        if cells is not None and len(cells) <= self.max_terms:
+            equation = " + ".join(f"{result.costs[i][j]} * {q}" for i, j, q in cells)
+            self.write(f"\nTotal cost: {equation} = {result.total_cost}\n\n\n")
+        else:
+            terms = f"{len(cells)} terms" if cells is not None else "equation omitted"
+            self.write(f"\nTotal cost ({terms}) = {result.total_cost}\n\n\n")
+
+    def result(self, result: SolveResult):
+        """Summary line, then (at `FULL`) the solution and the total cost equation."""
+        if self.verbosity < SUMMARY:
+            return
+        dummy = f", dummy flow {result.dummy_flow}" if result.dummy_flow else ""
+        self.line(f"-- {result.method}: total cost {result.total_cost}{dummy} ({result.elapsed:.3f}s)")
+        if self.verbosity >= FULL:
+            self.solution(result.solution)
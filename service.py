@@ -0,0 +1,234 @@
+"""
+Local solve service: newline-delimited JSON over TCP.
+
+Every request is one line:
+
+    {"id": 1, "supply": [...], "demand": [...], "costs": [[...], ...], "methods": ["nw", "vogel"]}
+
+and is answered by one line per method, in completion order, then a closing line:
+
+    {"id": 1, "method": "vogel", "total_cost": 779, "cells": [[0, 0, 5], ...], "elapsed": 0.001, "shared": false}
+    {"id": 1, "done": true}
+
+Invalid requests get `{"id": ..., "error": "..."}` and a method whose job fails (a crashed
+worker, for example) gets `{"id": ..., "method": ..., "error": "..."}` in place of its result;
+either way the connection stays open. Requests
+of one connection are answered in order; open several connections for concurrency.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+
+from batch import solve_instance
+from cache import fingerprint
+from combined_version import METHODS
+from dtypes import exact_quantities
+from validation import validate_problem
+
+LINE_LIMIT = 1 << 28  # requests carry whole cost matrices
+
+
+def _plain(value):
+    # Exact `Fraction` quantities and totals go back to the client as floats
+    return float(value) if isinstance(value, Fraction) else value
+
+
+def _solve(supply, demand, costs, method):
+    # Runs in a worker process
+    result = solve_instance(0, (supply, demand, costs), (method,))[0]
+    if result.error is not None:
+        return {"method": method, "error": result.error}
+    cells = [[i, j, _plain(q)] for i, row in enumerate(result.solution) for j, q in enumerate(row) if q]
+    return {"method": method, "total_cost": _plain(result.total_cost), "cells": cells, "elapsed": result.elapsed}
+
+
+class SolveService:
+    """
+    Solves submitted problems on a process pool.
+
+    - `workers` Worker processes (None = number of CPUs).
+    - `queue_size` Jobs waiting for a worker; `submit` waits while the queue is full, so
+      connections stop being read and clients are slowed down instead of piling up work.
+
+    Identical in-flight jobs (same problem fingerprint and method) are coalesced: the
+    later submissions wait for the first one instead of being queued. `requests`,
+    `coalesced` and `solved` count the jobs.
+    """
+    def __init__(self, workers: int = None, queue_size: int = 64):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.requests = self.coalesced = self.solved = 0
+        self._inflight = {}
+        self._queue = None
+        self._executor = None
+        self._dispatchers = []
+
+    async def start(self):
+        self._queue = asyncio.Queue(self.queue_size)
+        workers = self.workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(workers)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(workers)]
+
+    async def close(self):
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._executor.shutdown()
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            key, future, problem = await self._queue.get()
+            try:
+                future.set_result(await loop.run_in_executor(self._executor, _solve, *problem))
+                self.solved += 1
+            except Exception as error:
+                future.set_exception(error)
+            finally:
+                del self._inflight[key]
+                self._queue.task_done()
+
+    async def submit(self, supply, demand, costs, method: str, problem_key: str = None):
+        """Result of one method as a dict (see the module docstring); `shared` tells if it was coalesced."""
+        self.requests += 1
+        key = (problem_key or fingerprint(supply, demand, costs), method)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return dict(await asyncio.shield(future), shared=True)
+
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            await self._queue.put((key, future, (supply, demand, costs, method)))
+        except asyncio.CancelledError:
+            # The client left while waiting for room; coalesced waiters must not hang
+            del self._inflight[key]
+            future.cancel()
+            raise
+        return dict(await asyncio.shield(future), shared=False)
+
+    async def handle(self, reader, writer):
+        """Serves one connection."""
+        try:
+            while line := await reader.readline():
+                await self._answer(line, writer)
+        except (ConnectionError, asyncio.CancelledError):
+            pass  # client gone or server shutting down: just close the connection
+        finally:
+            writer.close()
+
+    async def _answer(self, line, writer):
+        def send(message):
+            writer.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            # Fractional quantities are solved exactly, so 0.1 + 0.2 supplies balance a 0.3 demand
+            supply, demand = exact_quantities(request["supply"]), exact_quantities(request["demand"])
+            costs = request["costs"]
+            methods = request.get("methods", list(METHODS))
+            unknown = [method for method in methods if method not in METHODS]
+            if unknown:
+                raise ValueError(f"Unknown methods {unknown}, expected some of {list(METHODS)}")
+            validation = validate_problem(supply, demand, costs)
+            if not validation.valid:
+                raise ValueError("; ".join(validation.errors()))
+            key = fingerprint(supply, demand, costs)
+        except (ValueError, KeyError, TypeError, AttributeError, OverflowError) as error:
+            send({"id": request_id, "error": f"Invalid request: {error}"})
+            await writer.drain()
+            return
+
+        async def run(method):
+            try:
+                return await self.submit(supply, demand, costs, method, key)
+            except Exception as error:
+                # e.g. BrokenProcessPool: answer for this method and keep serving the connection
+                return {"method": method, "error": f"{type(error).__name__}: {error}"}
+
+        jobs = [run(method) for method in methods]
+        for job in asyncio.as_completed(jobs):
+            send(dict(await job, id=request_id))
+            await writer.drain()
+        send({"id": request_id, "done": True})
+        await writer.drain()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765):
+        """Starts the pool and returns the listening `asyncio.Server`."""
+        await self.start()
+        return await asyncio.start_server(self.handle, host, port, limit=LINE_LIMIT)
+
+
+def _percentile(values, fraction):
+    # Nearest rank of sorted `values`
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+async def load_test(problems, host: str = "127.0.0.1", port: int = 8765, requests: int = 200,
+                    concurrency: int = 16, methods=None):
+    """
+    Sends `requests` problems (cycling through `problems`) over `concurrency` connections.
+
+    Returns a dict with the request count, seconds, throughput, p50/p99 latency (seconds
+    from sending a request to its closing line) and the number of coalesced results.
+    """
+    methods = list(methods or METHODS)
+    latencies, shared = [], 0
+    counter = iter(range(requests))
+
+    async def client():
+        nonlocal shared
+        reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        for k in counter:
+            supply, demand, costs = problems[k % len(problems)]
+            request = {"id": k, "supply": supply, "demand": demand, "costs": costs, "methods": methods}
+            start = time.perf_counter()
+            writer.write(json.dumps(request).encode() + b'\n')
+            await writer.drain()
+            while True:
+                answer = json.loads(await reader.readline())
+                if "error" in answer:
+                    raise RuntimeError(answer["error"])
+                if answer.get("done"):
+                    break
+                shared += answer["shared"]
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+        await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {"requests": len(latencies), "seconds": elapsed, "throughput": len(latencies) / elapsed,
+            "p50": _percentile(latencies, 0.50), "p99": _percentile(latencies, 0.99), "shared": shared}
+
+
+async def _serve_forever(args):
+    service = SolveService(args.workers, args.queue_size)
+    server = await service.serve(args.host, args.port)
+    print(f"Serving on {args.host}:{args.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transportation problem solve service (JSON lines over TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, help="worker processes (default: number of CPUs)")
+    parser.add_argument("--queue-size", type=int, default=64, help="jobs waiting for a worker before clients are slowed down")
+    try:
+        asyncio.run(_serve_forever(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
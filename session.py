@@ -0,0 +1,106 @@
+import time
+from bisect import bisect_left, bisect_right
+
+from combined_version import CostIndex, indexed_least_cost, indexed_russell, indexed_vogel, north_west_corner
+from report import SolveResult
+from validation import NotApplicableError, NotBalancedError, validate_problem
+
+
+def _move(order, cost, k, old, new):
+    # Moves index `k` of a line sorted by (cost, index) from cost `old` to cost `new`
+    lo, hi = bisect_left(cost, old), bisect_right(cost, old)
+    pos = bisect_left(order, k, lo, hi)
+    del order[pos], cost[pos]
+    lo, hi = bisect_left(cost, new), bisect_right(cost, new)
+    pos = bisect_left(order, k, lo, hi)
+    order.insert(pos, k)
+    cost.insert(pos, new)
+
+
+class SolverSession:
+    """
+    Transportation problem kept in memory across edits, for what-if re-runs.
+
+    - `supply`, `demand`, `costs` As for `BalancedProlemSolver`; the session works on its
+      own copies.
+    - `validate` Validate the problem once, raising `NotApplicableError` (the balance is
+      checked by `solve`, so edits may pass through unbalanced states).
+    - `sink` `instrumentation.Sink` receiving the events of every solve.
+
+    The `CostIndex` of the costs is built once and a cost edit only moves one entry of one
+    row and one column order, so a re-solve skips the O(mn log n) sort and the validation
+    scan. Solutions are cached per method until an edit invalidates them (North-West does
+    not depend on costs and survives cost edits). Solutions are `(row, col, quantity)`
+    cells, as `north_west_corner` returns them.
+    """
+    def __init__(self, supply: list[int], demand: list[int], costs, validate: bool = True, sink=None):
+        if validate and not validate_problem(supply, demand, costs).applicable:
+            raise NotApplicableError()
+        self.supply = list(supply)
+        self.demand = list(demand)
+        self.costs = [list(row) for row in costs]
+        self.sink = sink
+        self.index = CostIndex(self.costs)
+        self._excess = sum(self.supply) - sum(self.demand)
+        self._solutions = {}
+
+    @property
+    def balanced(self) -> bool:
+        return self._excess == 0
+
+    def add_supply(self, i: int, delta):
+        """Adds `delta` (may be negative) to the supply of source `i`."""
+        if self.supply[i] + delta < 0:
+            raise NotApplicableError("Supply and demand must not be negative")
+        self.supply[i] += delta
+        self._excess += delta
+        self._solutions.clear()
+
+    def add_demand(self, j: int, delta):
+        """Adds `delta` (may be negative) to the demand of destination `j`."""
+        if self.demand[j] + delta < 0:
+            raise NotApplicableError("Supply and demand must not be negative")
+        self.demand[j] += delta
+        self._excess -= delta
+        self._solutions.clear()
+
+    def set_cost(self, i: int, j: int, cost):
+        """Changes the cost of cell (i, j) and moves it inside the orders of row i and column j."""
+        if cost <= 0:
+            raise NotApplicableError()
+        old = self.costs[i][j]
+        if cost == old:
+            return
+        self.costs[i][j] = cost
+        row_order, row_cost, col_order, col_cost = self.index
+        _move(row_order[i], row_cost[i], j, old, cost)
+        _move(col_order[j], col_cost[j], i, old, cost)
+        self._solutions = {method: cells for method, cells in self._solutions.items() if method == "nw"}
+
+    def solve(self, method: str) -> SolveResult:
+        """Runs "nw", "vogel", "russell" or "least_cost" on the current problem, reusing the cached solution if any."""
+        if not self.balanced:
+            raise NotBalancedError()
+        start = time.perf_counter()
+        cells = self._solutions.get(method)
+        if cells is None:
+            cells = self._solutions[method] = self._run(method)
+        return SolveResult(method, cells, self.costs, time.perf_counter() - start)
+
+    def _run(self, method):
+        sink = self.sink
+        if sink is not None:
+            sink.start(method, len(self.supply), len(self.demand))
+        if method == "nw":
+            cells = north_west_corner(self.supply, self.demand, sink)
+        elif method == "vogel":
+            cells = list(indexed_vogel(self.supply, self.demand, *self.index, sink=sink))
+        elif method == "russell":
+            cells = list(indexed_russell(self.supply, self.demand, *self.index, sink=sink))
+        elif method == "least_cost":
+            cells = list(indexed_least_cost(self.supply, self.demand, *self.index, sink=sink))
+        else:
+            raise ValueError(f"Unknown method {method!r}")
+        if sink is not None:
+            sink.finish(method)
+        return cells
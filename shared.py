@@ -0,0 +1,273 @@
+"""
+Cost matrices in shared memory, for solving many supply/demand scenarios on a process pool.
+
+`SharedCostMatrix.create` copies a cost matrix and its sorted line orders (see
+`CostIndex`) once into a named `multiprocessing.shared_memory` block:
+
+    header | min cost | costs (m x n) | row orders | row costs | column orders | column costs
+
+Costs use the narrowest typecode (see `dtypes`) and the orders the narrowest integer
+typecode of their indices. Workers `attach` by name and get `memoryview` rows over the
+block, so the matrix is never pickled or copied: only supply and demand travel to them.
+The cost statistics of `validate_problem` are computed once, so a scenario is validated
+without reading the matrix again.
+"""
+import struct
+import time
+from array import array
+from multiprocessing import Pool, shared_memory
+
+from batch import BatchResult
+from combined_version import (
+    METHODS, BalancedProlemSolver, indexed_least_cost, indexed_russell, indexed_vogel, north_west_corner,
+)
+from dtypes import cost_typecode, integer_typecode
+from validation import TransportationProblemError, ValidationReport, validate_problem
+
+# Header: magic, version, cost typecode, index typecode, m, n, positive cells
+SHARED_MAGIC = b"TPSM"
+SHARED_VERSION = 1
+SHARED_HEADER = struct.Struct("<4sHcc8xQQQ")
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class SharedCostIndex:
+    """
+    Line orders of a `SharedCostMatrix`, laid out like `CostIndex` (rows of `memoryview`s),
+    so it can be passed as `cost_index` to `BalancedProlemSolver` or unpacked into the
+    incremental methods.
+    """
+    def __init__(self, row_order, row_cost, col_order, col_cost, nbytes):
+        self.row_order, self.row_cost, self.col_order, self.col_cost = row_order, row_cost, col_order, col_cost
+        self.shape = (len(row_order), len(col_order))
+        self.build_time = 0.0
+        self.nbytes = nbytes
+
+    def __iter__(self):
+        return iter((self.row_order, self.row_cost, self.col_order, self.col_cost))
+
+
+class SharedCostMatrix:
+    """
+    Cost matrix and its line orders in a named shared-memory block; see the module docstring.
+
+    - `name` Name of the block, for `attach` in other processes.
+    - `costs` Rows as `memoryview`s over the block.
+    - `cost_index` `SharedCostIndex` over the block.
+    - `min_cost`, `positive_cells` Cost statistics of `validate_problem`.
+
+    Use `create` in the owning process and `attach` in the workers. `close()` detaches a
+    process; the owner also frees the block with `unlink()` (a `with` block does both).
+    """
+    def __init__(self, block: shared_memory.SharedMemory, owner: bool = False):
+        self._block = block
+        self.owner = owner
+        magic, version, cost_code, index_code, m, n, positive_cells = SHARED_HEADER.unpack_from(block.buf)
+        if magic != SHARED_MAGIC or version != SHARED_VERSION:
+            self.close()
+            raise ValueError(f"Shared memory block {block.name!r} does not hold a cost matrix")
+        self.name = block.name
+        self.shape = (m, n)
+        self.positive_cells = positive_cells
+        cost_code, index_code = cost_code.decode(), index_code.decode()
+        self.typecode = cost_code
+
+        self._views = []
+        offset = SHARED_HEADER.size
+        self.min_cost = self._section(offset, 'd' if cost_code == 'd' else 'q', 1)[0] if m and n else None
+        offset += 8
+        self.costs, offset = self._rows(offset, cost_code, m, n)
+        index_start = offset
+        row_order, offset = self._rows(offset, index_code, m, n)
+        row_cost, offset = self._rows(offset, cost_code, m, n)
+        col_order, offset = self._rows(offset, index_code, n, m)
+        col_cost, offset = self._rows(offset, cost_code, n, m)
+        self.cost_index = SharedCostIndex(row_order, row_cost, col_order, col_cost, offset - index_start)
+
+    def _section(self, offset, typecode, count):
+        view = self._block.buf[offset:offset + count * array(typecode).itemsize].cast(typecode)
+        self._views.append(view)
+        return view
+
+    def _rows(self, offset, typecode, count, length):
+        flat = self._section(offset, typecode, count * length)
+        return [flat[k * length:(k + 1) * length] for k in range(count)], _aligned(offset + flat.nbytes)
+
+    @staticmethod
+    def layout_size(m: int, n: int, cost_code: str, index_code: str) -> int:
+        """Bytes of the block for an m x n matrix."""
+        costs = _aligned(m * n * array(cost_code).itemsize)
+        orders = _aligned(m * n * array(index_code).itemsize)
+        return SHARED_HEADER.size + 8 + 3 * costs + 2 * orders
+
+    @classmethod
+    def create(cls, costs, name: str = None) -> "SharedCostMatrix":
+        """
+        Copies `costs` (lists, `array`s or `memoryview` rows) and their line orders into a new block.
+
+        Raises `ValueError` for ragged matrices and costs beyond int64.
+        """
+        m, n = len(costs), len(costs[0]) if costs else 0
+        statistics = validate_problem([0] * m, [0] * n, costs)
+        if not statistics.shape_ok:
+            raise ValueError(f"The cost matrix must have {m} rows of {n} costs")
+        cost_code = cost_typecode(costs)
+        if cost_code is None:
+            raise ValueError("Costs beyond int64 cannot be stored in shared memory")
+        index_code = integer_typecode(0, max(m, n))
+
+        block = shared_memory.SharedMemory(name, create=True, size=max(1, cls.layout_size(m, n, cost_code, index_code)))
+        try:
+            SHARED_HEADER.pack_into(block.buf, 0, SHARED_MAGIC, SHARED_VERSION, cost_code.encode(),
+                                    index_code.encode(), m, n, statistics.positive_cells)
+            if m and n:
+                struct.pack_into('d' if cost_code == 'd' else 'q', block.buf, SHARED_HEADER.size, statistics.min_cost)
+            matrix = cls(block, owner=True)
+        except BaseException:
+            block.close()
+            block.unlink()
+            raise
+
+        # Rows are sorted one at a time and columns are read through zip(), so the
+        # orders never exist as lists of lists
+        index = matrix.cost_index
+        for i, row in enumerate(costs):
+            matrix.costs[i][:] = row if isinstance(row, array) and row.typecode == cost_code else array(cost_code, row)
+            order = sorted(range(n), key=row.__getitem__)
+            index.row_order[i][:] = array(index_code, order)
+            index.row_cost[i][:] = array(cost_code, [row[j] for j in order])
+        for j, column in enumerate(zip(*costs)):
+            order = sorted(range(m), key=column.__getitem__)
+            index.col_order[j][:] = array(index_code, order)
+            index.col_cost[j][:] = array(cost_code, [column[i] for i in order])
+        return matrix
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedCostMatrix":
+        """Attaches to a block made by `create` (in another process); nothing is copied."""
+        return cls(shared_memory.SharedMemory(name))
+
+    @property
+    def nbytes(self) -> int:
+        return self._block.size
+
+    def validate(self, supply, demand) -> ValidationReport:
+        """`validate_problem` for a scenario, from the cost statistics stored in the block."""
+        shape_ok = (len(supply), len(demand)) == self.shape
+        non_negative = (min(supply, default=0) >= 0) and (min(demand, default=0) >= 0)
+        return ValidationReport(len(supply), len(demand), shape_ok, non_negative,
+                                self.min_cost, self.positive_cells if shape_ok else 0, sum(supply), sum(demand))
+
+    def solver(self, supply, demand) -> BalancedProlemSolver:
+        """Validated `BalancedProlemSolver` for a scenario, reading costs and orders in place."""
+        validation = self.validate(supply, demand)
+        validation.raise_if_invalid()
+        solver = BalancedProlemSolver(supply, demand, self.costs, validate=False, cost_index=self.cost_index)
+        solver.validation = validation
+        return solver
+
+    def solve_cells(self, supply, demand, method: str):
+        """Basic cells `(row, col, quantity)` of a method from `METHODS` for a validated scenario."""
+        if method == "nw":
+            return north_west_corner(supply, demand)
+        if method == "vogel":
+            return list(indexed_vogel(supply, demand, *self.cost_index))
+        if method == "russell":
+            return list(indexed_russell(supply, demand, *self.cost_index))
+        if method == "least_cost":
+            return list(indexed_least_cost(supply, demand, *self.cost_index))
+        raise ValueError(f"Unknown method {method!r}")
+
+    def close(self):
+        # Views must be released before the block can be closed
+        self.costs = self.cost_index = None
+        views, self._views = self._views, []
+        try:
+            for view in views:
+                view.release()
+            self._block.close()
+        except BufferError:
+            # A caller still holds a row: the mapping goes away with the last view, so
+            # the collected `SharedMemory` must not try (and fail) to close it again
+            self._block.close = lambda: None
+
+    def unlink(self):
+        self._block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+def solve_scenario(matrix: SharedCostMatrix, index, supply, demand, methods):
+    """
+    Runs every method in `methods` on one scenario of `matrix`.
+
+    Returns one `BatchResult` per method whose `solution` holds the basic cells.
+    """
+    try:
+        matrix.validate(supply, demand).raise_if_invalid()
+    except TransportationProblemError as error:
+        return [BatchResult(index, method, error=str(error)) for method in methods]
+
+    results = []
+    for method in methods:
+        start = time.perf_counter()
+        try:
+            cells = matrix.solve_cells(supply, demand, method)
+        except TransportationProblemError as error:
+            results.append(BatchResult(index, method, error=str(error)))
+            continue
+        elapsed = time.perf_counter() - start
+        total_cost = sum(matrix.costs[i][j] * quantity for i, j, quantity in cells if quantity)
+        results.append(BatchResult(index, method, cells, total_cost, elapsed))
+    return results
+
+
+_worker_matrix = None
+
+
+def attach_worker(name: str):
+    """Pool initializer: attaches the worker to the block once."""
+    global _worker_matrix
+    _worker_matrix = SharedCostMatrix.attach(name)
+
+
+def _solve_task(args):
+    index, supply, demand, methods = args
+    return solve_scenario(_worker_matrix, index, supply, demand, methods)
+
+
+def solve_scenarios(matrix: SharedCostMatrix, scenarios, methods=("nw", "vogel", "russell"), processes=None,
+                    chunksize: int = 1):
+    """
+    Solves `(supply, demand)` scenarios against a shared cost matrix on a process pool.
+
+    - `scenarios` Iterable of scenarios; it is consumed lazily.
+    - `methods` Names from `METHODS` to run on every scenario.
+    - `processes` Pool size (`None` = number of CPUs, `0` = solve in this process).
+    - `chunksize` Scenarios sent to a worker at once.
+
+    Workers attach to `matrix` by name, so only the quantities are pickled. Yields a list
+    of `BatchResult` (one per method, `solution` as basic cells) for every scenario, in
+    completion order.
+    """
+    for method in methods:
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}, expected one of {', '.join(METHODS)}")
+
+    tasks = ((index, list(supply), list(demand), tuple(methods)) for index, (supply, demand) in enumerate(scenarios))
+    if processes == 0:
+        for index, supply, demand, methods in tasks:
+            yield solve_scenario(matrix, index, supply, demand, methods)
+        return
+
+    with Pool(processes, initializer=attach_worker, initargs=(matrix.name,)) as pool:
+        yield from pool.imap_unordered(_solve_task, tasks, chunksize)
@@ -0,0 +1,103 @@
+from array import array
+
+from combined_version import indexed_russell, indexed_vogel
+from validation import InfeasibleProblemError, NotApplicableError, NotBalancedError
+
+
+class SparseProblemSolver:
+    """
+    Transportation problem given as a list of lanes instead of a dense cost matrix.
+
+    - `supply` A list of supply quantities for each source.
+    - `demand` A list of demand quantities for each destination.
+    - `lanes` Iterable of `(source, destination, cost)`; missing lanes are forbidden and
+      every lane appears at most once.
+    - `cost_typecode` `array` typecode for the costs ('q' for integers, 'd' for floats).
+
+    Lanes are kept per row and per column, sorted by (cost, index), in compact `array`s, so
+    memory grows with the number of lanes and not with m x n. Every method returns the
+    basic cells as a list of `(row, col, quantity)` and leaves `supply`/`demand` untouched.
+    """
+    def __init__(self, supply: list[int], demand: list[int], lanes, cost_typecode: str = 'q'):
+        self.supply = supply
+        self.demand = demand
+        m, n = len(supply), len(demand)
+
+        if sum(supply) != sum(demand):
+            raise NotBalancedError()
+
+        # Group lanes by row
+        row_cols = [array('q') for _ in range(m)]
+        row_costs = [array(cost_typecode) for _ in range(m)]
+        for i, j, cost in lanes:
+            if not (0 <= i < m and 0 <= j < n):
+                raise NotApplicableError(f"Lane ({i}, {j}) is outside of the {m}x{n} problem")
+            if cost <= 0:
+                raise NotApplicableError()
+            row_cols[i].append(j)
+            row_costs[i].append(cost)
+
+        # Sort every row by (cost, column) and spread the lanes over the columns
+        self.row_order, self.row_cost = [], []
+        col_rows = [array('q') for _ in range(n)]
+        col_costs = [array(cost_typecode) for _ in range(n)]
+        for i in range(m):
+            cols, costs = row_cols[i], row_costs[i]
+            order = sorted(range(len(cols)), key=lambda k: (costs[k], cols[k]))
+            self.row_order.append(array('q', (cols[k] for k in order)))
+            self.row_cost.append(array(cost_typecode, (costs[k] for k in order)))
+            row_cols[i] = row_costs[i] = None
+            for j, cost in zip(self.row_order[i], self.row_cost[i]):
+                col_rows[j].append(i)
+                col_costs[j].append(cost)
+
+        # Rows were added in increasing order, so a stable sort by cost keeps row ties ordered
+        self.col_order, self.col_cost = [], []
+        for j in range(n):
+            rows, costs = col_rows[j], col_costs[j]
+            order = sorted(range(len(rows)), key=costs.__getitem__)
+            self.col_order.append(array('q', (rows[k] for k in order)))
+            self.col_cost.append(array(cost_typecode, (costs[k] for k in order)))
+            col_rows[j] = col_costs[j] = None
+
+    @property
+    def lane_count(self) -> int:
+        return sum(len(order) for order in self.row_order)
+
+    def cost(self, i: int, j: int):
+        """Cost of lane (i, j); raises `ValueError` if the lane does not exist."""
+        return self.row_cost[i][self.row_order[i].index(j)]
+
+    def nw_method(self):
+        """
+        North-West corner over the existing lanes: every row takes the left-most lane
+        whose destination still has demand. Equals the dense method when all lanes exist.
+        """
+        demand = list(self.demand)
+        solution = []
+        for i, supply in enumerate(self.supply):
+            for j in sorted(self.row_order[i]):
+                if supply == 0:
+                    break
+                if demand[j] == 0:
+                    continue
+                allocation = min(supply, demand[j])
+                solution.append((i, j, allocation))
+                supply -= allocation
+                demand[j] -= allocation
+            if supply:
+                raise InfeasibleProblemError()
+        return solution
+
+    def vogels_approximation_method(self):
+        """Vogel's approximation where penalties only consider existing lanes."""
+        return list(indexed_vogel(self.supply, self.demand, self.row_order, self.row_cost,
+                                  self.col_order, self.col_cost))
+
+    def russells_approximation_method(self):
+        """Russell's approximation where Ui, Vj and Δ only consider existing lanes."""
+        return list(indexed_russell(self.supply, self.demand, self.row_order, self.row_cost,
+                                    self.col_order, self.col_cost))
+
+    def calculate_total_cost(self, solution) -> int:
+        return sum(self.cost(i, j) * quantity for i, j, quantity in solution)
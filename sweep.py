@@ -0,0 +1,176 @@
+"""
+Scenario sweeps: many supply/demand scenarios solved against one fixed cost matrix.
+
+The matrix is copied once into a `SharedCostMatrix`, which holds its sorted line orders
+and its validation statistics, so a scenario costs only its own validation (sums and
+signs of the quantities) and the method itself. With `processes` the scenarios are
+spread over a pool whose workers attach to the matrix instead of receiving a copy.
+
+Scenario files hold pairs of lines, the supply then the demand (see
+`problem_io.iter_scenarios`):
+
+    python sweep.py problem.txt scenarios.txt --methods vogel russell --processes 4 --output results.jsonl
+"""
+import argparse
+import json
+import math
+import sys
+import time
+
+from combined_version import METHODS
+from problem_io import iter_scenarios, load_problem
+from shared import SharedCostMatrix, solve_scenarios
+
+
+class MethodSummary:
+    """
+    Statistics of one method over a sweep.
+
+    - `solved`, `failed` Number of scenarios.
+    - `total_costs` Total cost of every solved scenario, in completion order.
+    - `seconds` Time spent by the method over all scenarios.
+    - `wins` Scenarios where the method found the cheapest plan of the sweep's methods
+      (ties count for every method involved).
+    """
+    def __init__(self, method: str):
+        self.method = method
+        self.solved = self.failed = self.wins = 0
+        self.total_costs = []
+        self.seconds = 0.0
+
+    def add(self, result):
+        if result.error is not None:
+            self.failed += 1
+            return
+        self.solved += 1
+        self.total_costs.append(result.total_cost)
+        self.seconds += result.elapsed
+
+    def percentile(self, fraction: float):
+        """Nearest-rank percentile of the total costs (None before any scenario is solved)."""
+        if not self.total_costs:
+            return None
+        ordered = sorted(self.total_costs)
+        return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+    @property
+    def mean(self):
+        return sum(self.total_costs) / len(self.total_costs) if self.total_costs else None
+
+    def as_dict(self) -> dict:
+        return {"method": self.method, "solved": self.solved, "failed": self.failed, "wins": self.wins,
+                "min": min(self.total_costs, default=None), "p10": self.percentile(0.10),
+                "p50": self.percentile(0.50), "p90": self.percentile(0.90),
+                "max": max(self.total_costs, default=None), "mean": self.mean, "seconds": self.seconds}
+
+
+class Sweep:
+    """
+    Solves `(supply, demand)` scenarios against one cost matrix; see the module docstring.
+
+    - `costs` Cost matrix, copied once into shared memory with its line orders.
+    - `methods` Names from `METHODS` run on every scenario.
+    - `processes` Pool size (`0` = solve in this process, `None` = number of CPUs).
+    - `chunksize` Scenarios sent to a worker at once.
+
+    `summary` maps every method to its `MethodSummary`; `scenarios` and `elapsed` count
+    the scenarios and the seconds spent in `run`. Use as a context manager or call
+    `close()` to free the shared matrix.
+    """
+    def __init__(self, costs, methods=("nw", "vogel", "russell"), processes: int = 0, chunksize: int = 4):
+        for method in methods:
+            if method not in METHODS:
+                raise ValueError(f"Unknown method {method!r}, expected one of {', '.join(METHODS)}")
+        self.methods = tuple(methods)
+        self.processes = processes
+        self.chunksize = chunksize
+        self.matrix = SharedCostMatrix.create(costs)
+        self.summary = {method: MethodSummary(method) for method in self.methods}
+        self.scenarios = 0
+        self.elapsed = 0.0
+
+    def run(self, scenarios):
+        """
+        Yields one list of `BatchResult` per scenario (one per method, `solution` as basic
+        cells, `index` the scenario's position) in completion order, updating `summary`.
+        """
+        start = time.perf_counter()
+        try:
+            for results in solve_scenarios(self.matrix, scenarios, self.methods, self.processes, self.chunksize):
+                self.scenarios += 1
+                for result in results:
+                    self.summary[result.method].add(result)
+                cheapest = min((result.total_cost for result in results if result.error is None), default=None)
+                for result in results:
+                    if result.error is None and result.total_cost == cheapest:
+                        self.summary[result.method].wins += 1
+                yield results
+        finally:
+            self.elapsed += time.perf_counter() - start
+
+    @property
+    def throughput(self) -> float:
+        """Scenarios per second of `run`."""
+        return self.scenarios / self.elapsed if self.elapsed else 0.0
+
+    def print_summary(self, stream=None):
+        stream = stream or sys.stdout
+        stream.write(f"{self.scenarios} scenarios in {self.elapsed:.3f}s ({self.throughput:.1f}/s)\n")
+        width = max(len("method"), *(len(method) for method in self.summary))
+        stream.write(f"{'method':<{width}} | {'solved':>6} | {'failed':>6} | {'wins':>5} | {'min':>10} | {'p10':>10} | "
+                     f"{'p50':>10} | {'p90':>10} | {'max':>10} | {'mean':>12}\n")
+        for summary in self.summary.values():
+            row = summary.as_dict()
+            values = " | ".join(f"{'-' if row[key] is None else row[key]:>10}" for key in ("min", "p10", "p50", "p90", "max"))
+            mean = '-' if summary.mean is None else f"{float(summary.mean):.1f}"
+            stream.write(f"{summary.method:<{width}} | {summary.solved:>6} | {summary.failed:>6} | {summary.wins:>5} | "
+                         f"{values} | {mean:>12}\n")
+
+    def close(self):
+        self.matrix.close()
+        self.matrix.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solves many supply/demand scenarios against one cost matrix")
+    parser.add_argument("problem", help="problem file whose cost matrix is used (its supply/demand are ignored)")
+    parser.add_argument("scenarios", help="file of supply/demand line pairs ('-' for stdin)")
+    parser.add_argument("--format", choices=["text", "csv", "binary"], help="problem format (default: from the file extension)")
+    parser.add_argument("--methods", nargs="+", choices=list(METHODS), default=list(METHODS))
+    parser.add_argument("--processes", type=int, default=0, help="worker processes (default: solve in this process)")
+    parser.add_argument("--chunksize", type=int, default=4)
+    parser.add_argument("--output", help="write every result as a JSON line to this file")
+    args = parser.parse_args()
+
+    _, _, costs = load_problem(args.problem, args.format)
+    scenario_format = "csv" if args.scenarios.lower().endswith(".csv") else "text"
+    stream = sys.stdin if args.scenarios == "-" else open(args.scenarios)
+    output = open(args.output, 'w') if args.output else None
+    try:
+        with Sweep(costs, args.methods, args.processes, args.chunksize) as sweep:
+            for results in sweep.run(iter_scenarios(stream, scenario_format)):
+                if output is None:
+                    continue
+                for result in results:
+                    line = {"scenario": result.index, "method": result.method}
+                    if result.error is not None:
+                        line["error"] = result.error
+                    else:
+                        line.update(total_cost=result.total_cost, cells=[list(cell) for cell in result.solution if cell[2]])
+                    output.write(json.dumps(line, default=str) + '\n')
+            sweep.print_summary()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if output is not None:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Tests of anytime solving and of resuming a cost index cut short by a deadline."""
+import gc
+import time
+
+import pytest
+
+import anytime
+from anytime import anytime_solve
+from combined_version import BalancedProlemSolver, CostIndex, line_orders
+from test_methods import read_sample, tie_heavy_problem
+
+
+def test_sample_reaches_the_optimum():
+    supply, demand, costs, _ = read_sample()
+    updates = []
+    result = anytime_solve(BalancedProlemSolver(supply, demand, costs), 5.0, callback=updates.append)
+    assert (result.stage, result.total_cost, result.timed_out) == ("optimal", 743, False)
+    assert updates[0].stage == "nw" and updates[0].total_cost == 1015
+    assert updates[-1] is result
+
+
+def test_timeout_keeps_the_partial_index_on_the_solver():
+    supply, demand, costs = tie_heavy_problem(12, 7, 0)
+    solver = BalancedProlemSolver(supply, demand, costs)
+    result = anytime_solve(solver, 0.0)
+    assert (result.stage, result.timed_out) == ("nw", True)
+    assert solver._partial_index is not None
+    assert list(solver.cost_index) == list(CostIndex(costs))
+    assert solver._partial_index is None
+
+
+@pytest.mark.parametrize("rows,columns", [(0, 0), (5, 0), (12, 0), (12, 3)])
+def test_line_orders_resume_where_they_stopped(rows, columns):
+    _, _, costs = tie_heavy_problem(12, 7, 1)
+    full = line_orders(costs)
+    partial = tuple(lines[:count] for lines, count in zip(full, (rows, rows, columns, columns)))
+    with pytest.raises(TimeoutError):
+        line_orders(costs, time.perf_counter() - 1, partial)
+    assert line_orders(costs, partial=partial) == full
+
+
+@pytest.mark.parametrize("pause_gc", [False, True])
+def test_collector_is_only_paused_on_request(monkeypatch, pause_gc):
+    inside = []
+
+    def stages(solver, budget, methods):
+        inside.append(gc.isenabled())
+        yield "plan"
+        inside.append(gc.isenabled())
+
+    monkeypatch.setattr(anytime, "_stages", stages)
+    outside = [gc.isenabled() for _ in anytime.iter_anytime(None, pause_gc=pause_gc)]
+    assert inside == [not pause_gc] * 2
+    assert outside == [True] and gc.isenabled()
@@ -0,0 +1,68 @@
+"""Tests of the problem fingerprint and the result cache."""
+import json
+from array import array
+from fractions import Fraction
+
+import pytest
+
+from cache import ResultCache, fingerprint
+from combined_version import BalancedProlemSolver
+from problem_io import BINARY_EXTENSION, open_binary, write_binary
+from test_methods import read_sample
+
+
+def test_fingerprint_ignores_the_container(tmp_path):
+    supply, demand, costs, _ = read_sample()
+    path = tmp_path / ("sample" + BINARY_EXTENSION)
+    write_binary(str(path), supply, demand, costs, cost_typecode='q')
+    key = fingerprint(supply, demand, costs)
+    assert fingerprint(supply, demand, [array('q', row) for row in costs]) == key
+    with open_binary(str(path)) as problem:
+        assert fingerprint(problem.supply, problem.demand, problem.costs) == key
+    assert fingerprint(supply, demand, [row[::-1] for row in costs]) != key
+
+
+def test_fingerprint_of_costs_beyond_int64():
+    big = 1 << 70
+    key = fingerprint([1, 2], [3], [[1], [big]])
+    assert key == fingerprint([1, 2], [3], [[1], [big]])
+    assert key != fingerprint([1, 2], [3], [[1], [big + 1]])
+    # Rows are length-prefixed, so moving values between rows changes the key
+    assert fingerprint([1, 2], [3, 4], [[1, big], [3, 4]]) != fingerprint([1, 2], [3, 4], [[1], [big, 3, 4]])
+
+
+def entry(cells):
+    return {"shape": [1, cells], "cells": [[0, j, 1] for j in range(cells)], "total_cost": cells}
+
+
+def test_max_bytes_evicts_least_recently_used_first():
+    size = len(json.dumps(entry(5), separators=(',', ':')))
+    cache = ResultCache(max_bytes=3 * size)
+    for key in "abc":
+        cache.put(key, entry(5))
+    assert cache.evictions == 0
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("d", entry(5))
+    assert cache.size == 3 * size
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("d") is not None
+    assert cache.evictions == 1
+
+
+def test_directory_is_shared_between_caches(tmp_path):
+    supply, demand, costs, _ = read_sample()
+    first = ResultCache(directory=str(tmp_path))
+    assert first.solve(BalancedProlemSolver(supply, demand, costs), "vogel").total_cost == 779
+    assert first.misses == 1
+
+    second = ResultCache(directory=str(tmp_path))
+    result = second.solve(BalancedProlemSolver(supply, demand, costs), "vogel")
+    assert (result.total_cost, second.disk_hits, second.misses) == (779, 1, 0)
+    second.solve(BalancedProlemSolver(supply, demand, costs), "vogel")
+    assert second.hits == 1
+
+
+def test_fractional_quantities_are_not_cached():
+    cache = ResultCache()
+    cache.put("k", {"shape": [1, 1], "cells": [[0, 0, Fraction(1, 2)]], "total_cost": Fraction(1, 2)})
+    assert len(cache) == 0
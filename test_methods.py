@@ -0,0 +1,148 @@
+"""
+Regression tests of the methods of `BalancedProlemSolver`.
+
+The sample problem must keep the results recorded in `test_prog1.txt`, and the
+incremental engines must allocate exactly like the classic per-iteration loops,
+including their tie-breaking. MODI must reach the same optimum from every initial
+method. `tie_heavy_problem` and `dense` are shared with the tests
+of the other engines.
+"""
+import random
+import re
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from combined_version import METHODS, BalancedProlemSolver, CostIndex, solution_cost
+from dtypes import compact_costs
+from instrumentation import ListSink
+from modi import modi_method
+
+SAMPLE = Path(__file__).with_name("test_prog1.txt")
+
+# Classic loops by method name
+CLASSIC = {
+    "vogel": lambda solver: solver.vogels_approximation_method(),
+    "russell": lambda solver: solver.russells_approximation_method(),
+    "least_cost": lambda solver: solver.least_cost_method(),
+}
+
+
+def read_sample():
+    """Problem and recorded (solution, total cost) pairs of `test_prog1.txt`, in NW, Vogel, Russell order."""
+    text = SAMPLE.read_text()
+    values = [list(map(int, line.split(":")[1].split())) for line in text.splitlines()
+              if line.startswith("Enter the") and not line.startswith("Enter the cost matrix")]
+    supply, demand, costs = values[0], values[1], values[2:]
+    solutions = [[list(map(int, row.split(", "))) for row in re.findall(r"\[([\d, ]+)\]", block)]
+                 for block in re.findall(r"Solution Matrix:\n((?:\[.*\]\n)+)", text)]
+    totals = [int(total) for total in re.findall(r"Total cost: .* = (\d+)", text)]
+    return supply, demand, costs, list(zip(solutions, totals))
+
+
+def tie_heavy_problem(m, n, seed):
+    """Seeded balanced problem with costs in 1..3 and small quantities, so ties and degenerate steps are common."""
+    rng = random.Random(seed)
+    supply = [rng.randint(1, 6) for _ in range(m)]
+    demand = [1] * n
+    for _ in range(sum(supply) - n):
+        demand[rng.randrange(n)] += 1
+    if sum(demand) > sum(supply):
+        supply[-1] += sum(demand) - sum(supply)
+    costs = [[rng.randint(1, 3) for _ in range(n)] for _ in range(m)]
+    return supply, demand, costs
+
+
+# (m, n, seed) of the random instances
+SHAPES = [(1, 1), (1, 5), (5, 1), (3, 4), (4, 4), (6, 9), (12, 7)]
+INSTANCES = [(m, n, seed) for m, n in SHAPES for seed in range(12)]
+
+
+def steps(run, supply, demand, costs):
+    # Allocation order as (row, col, quantity) events, and the solution itself
+    sink = ListSink()
+    solution = run(BalancedProlemSolver(supply, demand, costs, sink=sink))
+    return [(event.row, event.col, event.allocation) for event in sink.events], solution
+
+
+def dense(cells, m, n):
+    solution = [[0] * n for _ in range(m)]
+    for i, j, quantity in cells:
+        solution[i][j] = quantity
+    return solution
+
+
+def test_sample_matches_recorded_results():
+    supply, demand, costs, recorded = read_sample()
+    solver = BalancedProlemSolver(supply, demand, costs)
+    solutions = [solver.nw_method(), solver.vogels_approximation_method(), solver.russells_approximation_method()]
+    assert [total for _, total in recorded] == [1015, 779, 807]
+    for solution, (expected, total) in zip(solutions, recorded):
+        assert solution == expected
+        assert solution_cost(costs, solution) == total
+
+
+def test_sample_incremental_methods():
+    supply, demand, costs, recorded = read_sample()
+    solver = BalancedProlemSolver(supply, demand, costs)
+    assert solver.vogels_approximation_method(incremental=True) == recorded[1][0]
+    assert solver.russells_approximation_method(incremental=True) == recorded[2][0]
+    assert solution_cost(costs, solver.least_cost_method()) == 814
+    assert solver.least_cost_method(incremental=True) == solver.least_cost_method()
+
+
+@pytest.mark.parametrize("method", list(CLASSIC))
+@pytest.mark.parametrize("m,n,seed", INSTANCES)
+def test_incremental_matches_classic(method, m, n, seed):
+    supply, demand, costs = tie_heavy_problem(m, n, seed)
+    assert steps(METHODS[method], supply, demand, costs) == steps(CLASSIC[method], supply, demand, costs)
+
+
+def assert_feasible(solution, supply, demand):
+    assert [sum(row) for row in solution] == supply
+    assert [sum(column) for column in zip(*solution)] == demand
+    assert all(quantity >= 0 for row in solution for quantity in row)
+
+
+def test_modi_sample_optimum():
+    supply, demand, costs, _ = read_sample()
+    result = modi_method(costs, BalancedProlemSolver(supply, demand, costs).vogels_approximation_method())
+    assert result.total_cost == 743
+    assert_feasible(result.solution, supply, demand)
+
+
+@pytest.mark.parametrize("m,n,seed", INSTANCES)
+def test_modi_reaches_one_optimum_from_every_start(m, n, seed):
+    supply, demand, costs = tie_heavy_problem(m, n, seed)
+    solver = BalancedProlemSolver(supply, demand, costs)
+    starts = [solver.nw_method(), *(CLASSIC[method](solver) for method in CLASSIC)]
+    results = [modi_method(costs, start) for start in starts]
+    for start, result in zip(starts, results):
+        assert_feasible(result.solution, supply, demand)
+        assert result.total_cost == solution_cost(costs, result.solution) <= solution_cost(costs, start)
+    assert len({result.total_cost for result in results}) == 1
+
+
+def test_modi_degenerate_start():
+    # NW allocates 2 cells where a basis needs 3: the basis is completed with a zero-flow
+    # cell before pricing, and the optimum sends everything along the cost-1 lanes
+    supply, demand, costs = [5, 5], [5, 5], [[4, 1], [1, 4]]
+    start = BalancedProlemSolver(supply, demand, costs).nw_method()
+    assert start == [[5, 0], [0, 5]]
+    result = modi_method(costs, start)
+    assert result.solution == [[0, 5], [5, 0]]
+    assert result.total_cost == 10
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_cost_index_nbytes_matches_traced_memory(compact):
+    _, _, costs = tie_heavy_problem(300, 400, 0)
+    costs = [[cost * 1000 for cost in row] for row in costs]
+    if compact:
+        costs = compact_costs(costs)
+    tracemalloc.start()
+    index = CostIndex(costs)
+    traced = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert index.nbytes == pytest.approx(traced, rel=0.05)
@@ -0,0 +1,21 @@
+"""Tests of the out-of-core methods: they must allocate like the in-memory ones for any block size."""
+import pytest
+
+from combined_version import METHODS, BalancedProlemSolver, solution_cost
+from outofcore import solve_out_of_core
+from problem_io import BINARY_EXTENSION, write_binary
+from test_methods import INSTANCES, dense, tie_heavy_problem
+
+
+@pytest.mark.parametrize("block_rows", [0, 1, 2, 5])
+@pytest.mark.parametrize("m,n,seed", INSTANCES[::3])
+def test_out_of_core_matches_in_memory(tmp_path, block_rows, m, n, seed):
+    supply, demand, costs = tie_heavy_problem(m, n, seed)
+    path = tmp_path / ("problem" + BINARY_EXTENSION)
+    write_binary(str(path), supply, demand, costs)
+    solver = BalancedProlemSolver(supply, demand, costs)
+    for method in METHODS:
+        result = solve_out_of_core(str(path), method, block_rows)
+        expected = METHODS[method](solver)
+        assert dense(result.solution, m, n) == expected
+        assert result.total_cost == solution_cost(costs, expected)
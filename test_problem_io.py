@@ -0,0 +1,52 @@
+"""Tests of the problem file formats."""
+import pytest
+
+from problem_io import BINARY_EXTENSION, convert_to_binary, open_binary, write_binary
+from test_methods import read_sample
+
+
+@pytest.fixture
+def sample_binary(tmp_path):
+    supply, demand, costs, _ = read_sample()
+    path = tmp_path / ("sample" + BINARY_EXTENSION)
+    write_binary(str(path), supply, demand, costs)
+    return path
+
+
+def test_binary_round_trip(sample_binary):
+    supply, demand, costs, _ = read_sample()
+    with open_binary(str(sample_binary)) as problem:
+        assert (problem.supply, problem.demand) == (supply, demand)
+        assert [row.tolist() for row in problem.costs] == costs
+
+
+@pytest.mark.parametrize("cut", [-1, 40, 20, 0])
+def test_truncated_binary_is_rejected(sample_binary, cut):
+    # Cut inside the costs, inside the quantities, inside the header, or empty
+    data = sample_binary.read_bytes()
+    sample_binary.write_bytes(data[:cut])
+    with pytest.raises(ValueError, match="truncated"):
+        open_binary(str(sample_binary))
+
+
+@pytest.mark.parametrize("integer_rows", [0, 1, 3])
+def test_convert_switches_to_double_at_a_fractional_cost(tmp_path, integer_rows):
+    # The integer rows written before the first fractional one are rewritten as 'd'
+    costs = [[4, 6, 1], [2, 8, 5], [7, 3, 9], [1, 1, 2]]
+    costs[integer_rows][1] = 50.5
+    source, destination = tmp_path / "problem.txt", tmp_path / ("problem" + BINARY_EXTENSION)
+    source.write_text("\n".join(" ".join(map(str, line)) for line in [[5, 5, 5, 3], [6, 6, 6], *costs]))
+    convert_to_binary(str(source), str(destination))
+    with open_binary(str(destination)) as problem:
+        assert problem.costs[0].format == 'd'
+        assert [row.tolist() for row in problem.costs] == costs
+
+
+def test_fractional_costs_with_an_integer_typecode_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="fractional"):
+        write_binary(str(tmp_path / "problem.tpb"), [1], [1], iter([[50.5]]), cost_typecode='q')
+
+
+def test_costs_beyond_int64_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="int64"):
+        write_binary(str(tmp_path / "problem.tpb"), [1], [1], iter([[1 << 70]]))
@@ -0,0 +1,63 @@
+"""
+Tests of the answers of `SolveService` to one request line, without a network or a pool.
+"""
+import asyncio
+import json
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from service import SolveService, _solve as service_solve
+from test_methods import read_sample
+
+
+class Writer:
+    # Collects the answer lines of one connection
+    def __init__(self):
+        self.lines = []
+
+    def write(self, data):
+        self.lines.extend(json.loads(line) for line in data.splitlines())
+
+    async def drain(self):
+        pass
+
+
+def answer(service, request):
+    writer = Writer()
+    asyncio.run(service._answer(json.dumps(request).encode(), writer))
+    return writer.lines
+
+
+def test_failed_job_is_answered_per_method():
+    async def submit(supply, demand, costs, method, problem_key=None):
+        if method == "vogel":
+            raise BrokenProcessPool("a worker died")
+        return {"method": method, "total_cost": 1015, "cells": [], "elapsed": 0.0, "shared": False}
+
+    service = SolveService()
+    service.submit = submit
+    supply, demand, costs, _ = read_sample()
+    lines = answer(service, {"id": 7, "supply": supply, "demand": demand, "costs": costs, "methods": ["nw", "vogel"]})
+    by_method = {line["method"]: line for line in lines[:-1]}
+    assert by_method["nw"]["total_cost"] == 1015
+    assert by_method["vogel"] == {"id": 7, "method": "vogel", "error": "BrokenProcessPool: a worker died"}
+    assert lines[-1] == {"id": 7, "done": True}
+
+
+def test_invalid_request_is_answered_with_an_error():
+    lines = answer(SolveService(), {"id": 3, "supply": [1], "demand": [2], "costs": [[1]]})
+    assert len(lines) == 1 and lines[0]["id"] == 3 and "error" in lines[0]
+
+
+def test_fractional_quantities_are_exact():
+    service = SolveService()
+
+    async def submit(supply, demand, costs, method, problem_key=None):
+        return dict(service_solve(supply, demand, costs, method), shared=False)
+
+    service.submit = submit
+    lines = answer(service, {"id": 1, "supply": [0.1, 0.2], "demand": [0.3], "costs": [[2], [3]], "methods": ["nw"]})
+    assert lines[0]["cells"] == [[0, 0, 0.1], [1, 0, 0.2]]
+    assert lines[0]["total_cost"] == pytest.approx(0.8)
+    assert lines[-1] == {"id": 1, "done": True}
@@ -0,0 +1,29 @@
+"""Tests of `SolverSession`: a re-solve after edits must equal a fresh solver."""
+import random
+
+import pytest
+
+from combined_version import METHODS, BalancedProlemSolver
+from session import SolverSession
+from test_methods import dense, tie_heavy_problem
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_session_after_edits_matches_fresh_solver(seed):
+    rng = random.Random(seed)
+    supply, demand, costs = tie_heavy_problem(6, 8, seed)
+    session = SolverSession(supply, demand, costs)
+    for method in METHODS:
+        session.solve(method)
+    for _ in range(5):
+        i, j = rng.randrange(6), rng.randrange(8)
+        session.set_cost(i, j, rng.randint(1, 3))
+        costs[i][j] = session.costs[i][j]
+        if rng.random() < 0.5:
+            session.add_supply(i, 1)
+            session.add_demand(j, 1)
+            supply[i] += 1
+            demand[j] += 1
+        solver = BalancedProlemSolver(supply, demand, costs)
+        for method in METHODS:
+            assert dense(session.solve(method).solution, 6, 8) == METHODS[method](solver)
@@ -0,0 +1,17 @@
+"""Tests of `SparseProblemSolver`: with every lane present it must equal the dense methods."""
+import pytest
+
+from combined_version import BalancedProlemSolver
+from sparse import SparseProblemSolver
+from test_methods import INSTANCES, dense, tie_heavy_problem
+
+
+@pytest.mark.parametrize("m,n,seed", INSTANCES[::2])
+def test_sparse_with_every_lane_matches_dense(m, n, seed):
+    supply, demand, costs = tie_heavy_problem(m, n, seed)
+    lanes = [(i, j, cost) for i, row in enumerate(costs) for j, cost in enumerate(row)]
+    sparse = SparseProblemSolver(supply, demand, lanes)
+    solver = BalancedProlemSolver(supply, demand, costs)
+    assert dense(sparse.nw_method(), m, n) == solver.nw_method()
+    assert dense(sparse.vogels_approximation_method(), m, n) == solver.vogels_approximation_method()
+    assert dense(sparse.russells_approximation_method(), m, n) == solver.russells_approximation_method()
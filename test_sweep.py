@@ -0,0 +1,33 @@
+"""Tests of the scenario sweep statistics and report."""
+import io
+
+from batch import BatchResult
+from sweep import MethodSummary, Sweep
+from test_methods import read_sample
+
+
+def summary_of(total_costs):
+    summary = MethodSummary("nw")
+    for total_cost in total_costs:
+        summary.add(BatchResult(0, "nw", total_cost=total_cost))
+    return summary
+
+
+def test_percentiles_are_nearest_rank():
+    assert summary_of([1015, 895]).percentile(0.50) == 895
+    deciles = summary_of(range(10, 110, 10))
+    assert [deciles.percentile(fraction) for fraction in (0.10, 0.50, 0.90, 1.0)] == [10, 50, 90, 100]
+    assert deciles.percentile(0.0) == 10
+    assert summary_of([]).percentile(0.50) is None
+
+
+def test_summary_columns_fit_the_longest_method():
+    supply, demand, costs, _ = read_sample()
+    with Sweep(costs, ("nw", "least_cost")) as sweep:
+        for _ in sweep.run([(supply, demand)]):
+            pass
+        stream = io.StringIO()
+        sweep.print_summary(stream)
+    table = stream.getvalue().splitlines()[1:]
+    assert [line.split(" | ")[0] for line in table] == ["method    ", "nw        ", "least_cost"]
+    assert len({line.index("|") for line in table}) == 1
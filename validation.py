@@ -0,0 +1,97 @@
+class TransportationProblemError(ValueError):
+    """Base class of the errors raised for invalid transportation problems."""
+
+
+class NotApplicableError(TransportationProblemError):
+    """Costs are zero/negative, the shape is wrong or the problem is degenerate."""
+    def __init__(self, message: str = "The method is not applicable!"):
+        super().__init__(message)
+
+
+class NotBalancedError(TransportationProblemError):
+    """Total supply differs from total demand."""
+    def __init__(self, message: str = "The problem is not balanced!"):
+        super().__init__(message)
+
+
+class InfeasibleProblemError(TransportationProblemError):
+    """A row/column still has supply/demand but no lane left to ship it."""
+    def __init__(self, message: str = "The problem is infeasible: a line has supply/demand left but no open lane"):
+        super().__init__(message)
+
+
+class ValidationReport:
+    """
+    Result of `validate_problem`.
+
+    - `shape_ok` The cost matrix is m x n.
+    - `non_negative_quantities` No supply/demand value is negative.
+    - `positive_costs` Every cost is > 0 (`min_cost` holds the smallest one).
+    - `positive_cells` Number of cells with a positive cost.
+    - `degenerate` Fewer than m + n - 1 positive cells.
+    - `balanced` Total supply equals total demand.
+    """
+    def __init__(self, m, n, shape_ok, non_negative_quantities, min_cost, positive_cells, total_supply, total_demand):
+        self.m, self.n = m, n
+        self.shape_ok = shape_ok
+        self.non_negative_quantities = non_negative_quantities
+        self.min_cost = min_cost
+        self.positive_costs = min_cost is not None and min_cost > 0
+        self.positive_cells = positive_cells
+        self.degenerate = positive_cells < m + n - 1
+        self.total_supply = total_supply
+        self.total_demand = total_demand
+        self.balanced = total_supply == total_demand
+
+    @property
+    def applicable(self) -> bool:
+        return self.shape_ok and self.non_negative_quantities and self.positive_costs and not self.degenerate
+
+    @property
+    def valid(self) -> bool:
+        return self.applicable and self.balanced
+
+    def errors(self) -> list[str]:
+        errors = []
+        if not self.shape_ok:
+            errors.append(f"The cost matrix must have {self.m} rows of {self.n} costs")
+        if not self.non_negative_quantities:
+            errors.append("Supply and demand must not be negative")
+        if self.shape_ok and not self.positive_costs:
+            errors.append(f"Costs must be positive (smallest cost is {self.min_cost})")
+        if self.shape_ok and self.degenerate:
+            errors.append(f"Only {self.positive_cells} positive cells, fewer than m + n - 1 = {self.m + self.n - 1}")
+        if not self.balanced:
+            errors.append(f"Total supply {self.total_supply} differs from total demand {self.total_demand}")
+        return errors
+
+    def raise_if_invalid(self):
+        """Raises `NotApplicableError` or `NotBalancedError`, in the order the solver always checked them."""
+        if not self.applicable:
+            raise NotApplicableError()
+        if not self.balanced:
+            raise NotBalancedError()
+
+
+def validate_problem(supply, demand, costs) -> ValidationReport:
+    """
+    Checks shape, quantities, cost positivity, degeneracy and balance in one pass over the
+    cost rows. Rows are scanned with the built-in `min()`, and positive cells are only
+    counted (at Python speed) in rows that contain a non-positive cost.
+    """
+    m, n = len(supply), len(demand)
+    shape_ok = len(costs) == m
+    min_cost, positive_cells = None, 0
+    for row in costs:
+        if len(row) != n:
+            shape_ok = False
+            break
+        if not n:
+            continue
+        row_min = min(row)
+        if min_cost is None or row_min < min_cost:
+            min_cost = row_min
+        positive_cells += n if row_min > 0 else sum(1 for cost in row if cost > 0)
+
+    non_negative = (min(supply, default=0) >= 0) and (min(demand, default=0) >= 0)
+    return ValidationReport(m, n, shape_ok, non_negative, min_cost, positive_cells, sum(supply), sum(demand))